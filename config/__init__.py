@@ -1,8 +1,10 @@
+from ._yaml_cache import load_config
 from .database import get_mongodb_client, get_database, get_collection
 from .storage import get_minio_client, ensure_buckets
 from .kafka_config import get_kafka_consumer, get_kafka_producer
 
 __all__ = [
+    'load_config',
     'get_mongodb_client',
     'get_database',
     'get_collection',
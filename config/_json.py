@@ -0,0 +1,14 @@
+# orjson reads and writes bytes directly; fall back to the stdlib json module
+try:
+    import orjson
+
+    deserialize_json = orjson.loads
+    serialize_json = orjson.dumps
+except ImportError:
+    import json
+
+    def deserialize_json(data: bytes):
+        return json.loads(data.decode('utf-8'))
+
+    def serialize_json(value) -> bytes:
+        return json.dumps(value).encode('utf-8')
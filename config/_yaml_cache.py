@@ -0,0 +1,39 @@
+import os
+from typing import Any, Dict, Tuple
+
+from yaml import load
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader
+
+# path -> (mtime_ns, size, parsed config)
+_CACHE: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+
+def load_config(path: str = 'config.yaml') -> Dict[str, Any]:
+    """
+    Load configuration from a YAML file, reusing the parsed result.
+
+    The file is only re-read when its modification time or size changes,
+    so repeated calls cost a single stat() instead of a full YAML parse.
+    The returned dict is shared between callers and must not be mutated.
+
+    Args:
+        path: Path to the YAML configuration file
+
+    Returns:
+        Dict: Parsed configuration
+    """
+    stat = os.stat(path)
+    cached = _CACHE.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    with open(path, 'r') as f:
+        config = load(f, Loader=_Loader)
+
+    _CACHE[path] = (stat.st_mtime_ns, stat.st_size, config)
+    return config
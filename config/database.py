@@ -1,25 +1,32 @@
 import os
-from typing import Optional
-from pymongo import MongoClient
+import atexit
+from typing import Optional, Dict, Any, List, Tuple
+from pymongo import MongoClient, IndexModel, ASCENDING
 from pymongo.database import Database
 from pymongo.collection import Collection
-import yaml
+from pymongo.errors import BulkWriteError
+from ._yaml_cache import load_config
 
+# Process-wide client; MongoClient is thread-safe and pools connections
+_client: Optional[MongoClient] = None
 
-def load_config():
-    """Load configuration from config.yaml."""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
 
-
-def get_mongodb_client() -> MongoClient:
+def get_mongodb_client(config: Optional[Dict[str, Any]] = None) -> MongoClient:
     """
-    Create and return MongoDB client.
+    Return the shared MongoDB client, creating it on first use.
+
+    Args:
+        config: Parsed configuration (loads config.yaml if None)
 
     Returns:
         MongoClient: MongoDB client instance
     """
-    config = load_config()
+    global _client
+    if _client is not None:
+        return _client
+
+    if config is None:
+        config = load_config()
     mongo_config = config['mongodb']
 
     host = os.getenv('MONGODB_HOST', mongo_config['host'])
@@ -27,50 +34,66 @@ def get_mongodb_client() -> MongoClient:
 
     connection_string = f"mongodb://{host}:{port}/"
 
-    client = MongoClient(connection_string)
+    # minPoolSize makes the driver open sockets in the background, so the
+    # first queries don't pay connection setup latency
+    client = MongoClient(
+        connection_string,
+        minPoolSize=int(os.getenv('MONGODB_MIN_POOL', '5')),
+        maxPoolSize=int(os.getenv('MONGODB_MAX_POOL', '50')),
+        serverSelectionTimeoutMS=5000
+    )
 
-    # Test connection
-    client.server_info()
-    print(f"Connected to MongoDB at {host}:{port}")
+    print(f"MongoDB client initialized for {host}:{port}")
+
+    _client = client
+    atexit.register(client.close)
 
     return client
 
 
-def get_database(client: Optional[MongoClient] = None) -> Database:
+def get_database(client: Optional[MongoClient] = None,
+                 config: Optional[Dict[str, Any]] = None) -> Database:
     """
     Get database instance.
 
     Args:
         client: MongoDB client instance (creates new if None)
+        config: Parsed configuration (loads config.yaml if None)
 
     Returns:
         Database: MongoDB database instance
     """
+    if config is None:
+        config = load_config()
+
     if client is None:
-        client = get_mongodb_client()
+        client = get_mongodb_client(config)
 
-    config = load_config()
     db_name = os.getenv('MONGODB_DATABASE', config['mongodb']['database'])
 
     return client[db_name]
 
 
 def get_collection(collection_name: str,
-                   db: Optional[Database] = None) -> Collection:
+                   db: Optional[Database] = None,
+                   config: Optional[Dict[str, Any]] = None) -> Collection:
     """
     Get collection instance.
 
     Args:
         collection_name: Name of the collection
         db: Database instance (creates new if None)
+        config: Parsed configuration (loads config.yaml if None)
 
     Returns:
         Collection: MongoDB collection instance
     """
+    if config is None:
+        config = load_config()
+
     if db is None:
-        db = get_database()
+        db = get_database(config=config)
 
-    config = load_config()
     collections = config['mongodb']['collections']
 
     # Map logical names to actual collection names
@@ -79,10 +102,46 @@ def get_collection(collection_name: str,
     return db[actual_name]
 
 
+def insert_documents(collection: Collection, docs: List[Dict[str, Any]],
+                     **kwargs) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Insert a batch of documents with one unordered insert_many.
+
+    Failures are reported and returned instead of raised, so one bad batch
+    doesn't stop the caller.
+
+    Args:
+        collection: Target collection
+        docs: Documents to insert
+        **kwargs: Extra insert_many options (e.g. bypass_document_validation)
+
+    Returns:
+        Tuple of (number of documents inserted, documents that failed)
+    """
+    if not docs:
+        return 0, []
+
+    try:
+        result = collection.insert_many(docs, ordered=False, **kwargs)
+        return len(result.inserted_ids), []
+    except BulkWriteError as e:
+        # Unordered inserts keep going past failed documents
+        write_errors = e.details.get('writeErrors', [])
+        print(f"Error storing {len(write_errors)} documents in {collection.name}: {e}")
+        return e.details.get('nInserted', 0), [docs[error['index']] for error in write_errors]
+    except Exception as e:
+        # Anything else (e.g. a lost connection) fails only this batch
+        print(f"Error storing {len(docs)} documents in {collection.name}: {e}")
+        return 0, list(docs)
+
+
 def create_indexes(db: Database):
     """
     Create necessary indexes for collections.
 
+    Indexes are sent as one createIndexes command per collection, which is
+    a no-op on the server for indexes that already exist.
+
     Args:
         db: Database instance
     """
@@ -90,25 +149,29 @@ def create_indexes(db: Database):
     collections = config['mongodb']['collections']
 
     # Species collection indexes
-    species_coll = db[collections['species']]
-    species_coll.create_index('key', unique=True)
-    species_coll.create_index('scientificName')
+    db[collections['species']].create_indexes([
+        IndexModel('key', unique=True),
+        IndexModel([('scientificName', ASCENDING), ('key', ASCENDING)]),
+    ])
 
     # Observations collection indexes
-    obs_coll = db[collections['observations']]
-    obs_coll.create_index('key')
-    obs_coll.create_index([('location.latitude', 1), ('location.longitude', 1)])
-    obs_coll.create_index('timestamp')
+    db[collections['observations']].create_indexes([
+        IndexModel('key'),
+        IndexModel([('location.latitude', ASCENDING), ('location.longitude', ASCENDING)]),
+        IndexModel('timestamp'),
+    ])
 
     # Classifications collection indexes
-    class_coll = db[collections['classifications']]
-    class_coll.create_index('audio_file_id')
-    class_coll.create_index('key')
-    class_coll.create_index('confidence')
+    db[collections['classifications']].create_indexes([
+        IndexModel('audio_file_id'),
+        IndexModel('key'),
+        IndexModel('confidence'),
+    ])
 
     # Audio files collection indexes
-    audio_coll = db[collections['audio_files']]
-    audio_coll.create_index('minio_path', unique=True)
-    audio_coll.create_index('filename')
+    db[collections['audio_files']].create_indexes([
+        IndexModel('minio_path', unique=True),
+        IndexModel('filename'),
+    ])
 
     print("Database indexes created")
@@ -1,13 +1,12 @@
 import os
+import atexit
+from typing import Optional
 from kafka import KafkaConsumer, KafkaProducer
-import json
-import yaml
+from ._yaml_cache import load_config
+from ._json import deserialize_json, serialize_json
 
-
-def load_config():
-    """Load configuration from config.yaml."""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
+# Shared producer; KafkaProducer is thread-safe and batches internally
+_producer: Optional[KafkaProducer] = None
 
 
 def get_kafka_consumer() -> KafkaConsumer:
@@ -35,7 +34,7 @@ def get_kafka_consumer() -> KafkaConsumer:
         group_id=group_id,
         auto_offset_reset=auto_offset_reset,
         enable_auto_commit=True,
-        value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+        value_deserializer=deserialize_json,
         consumer_timeout_ms=10000  # 10 seconds timeout
     )
 
@@ -47,11 +46,15 @@ def get_kafka_consumer() -> KafkaConsumer:
 
 def get_kafka_producer() -> KafkaProducer:
     """
-    Create and return Kafka producer.
+    Return the shared Kafka producer, creating it on first use.
 
     Returns:
         KafkaProducer: Kafka producer instance
     """
+    global _producer
+    if _producer is not None:
+        return _producer
+
     config = load_config()
     kafka_config = config['kafka']
 
@@ -60,11 +63,19 @@ def get_kafka_producer() -> KafkaProducer:
         kafka_config['bootstrap_servers']
     )
 
+    # Same tuning keys and defaults as the ornithology producer
     producer = KafkaProducer(
         bootstrap_servers=bootstrap_servers,
-        value_serializer=lambda v: json.dumps(v).encode('utf-8')
+        value_serializer=serialize_json,
+        batch_size=kafka_config.get('batch_size', 200_000),
+        linger_ms=kafka_config.get('linger_ms', 50),
+        acks=kafka_config.get('acks', 1),
+        compression_type=kafka_config.get('compression_type', 'lz4')
     )
 
     print(f"Kafka producer connected at {bootstrap_servers}")
 
+    _producer = producer
+    atexit.register(producer.close)
+
     return producer
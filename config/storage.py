@@ -1,13 +1,24 @@
 import os
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Union
+import certifi
+import urllib3
 from minio import Minio
 from minio.error import S3Error
-import yaml
+from ._yaml_cache import load_config
 
+# Files larger than one part are sent as a multipart upload whose parts are
+# uploaded in parallel; 16 MiB parts keep the request count low for large
+# recordings while bounding the memory held by in-flight parts
+MULTIPART_PART_SIZE = 16 * 1024 * 1024
+MULTIPART_PARALLEL_UPLOADS = 4
+# HTTP connections kept per MinIO host. The client's default of 10 is below
+# what concurrent uploads with parallel parts use
+MINIO_POOL_SIZE = 32
 
-def load_config():
-    """Load configuration from config.yaml."""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
+# Set once the configured buckets have been checked or created
+_buckets_ready = False
 
 
 def get_minio_client() -> Minio:
@@ -25,11 +36,22 @@ def get_minio_client() -> Minio:
     secret_key = os.getenv('MINIO_SECRET_KEY', minio_config['secret_key'])
     secure = minio_config.get('secure', False)
 
+    # Same settings as the client's default pool apart from its size
+    http_client = urllib3.PoolManager(
+        timeout=urllib3.Timeout(connect=300, read=300),
+        maxsize=int(os.getenv('MINIO_MAX_POOL', MINIO_POOL_SIZE)),
+        cert_reqs='CERT_REQUIRED',
+        ca_certs=os.environ.get('SSL_CERT_FILE') or certifi.where(),
+        retries=urllib3.Retry(total=5, backoff_factor=0.2,
+                              status_forcelist=[500, 502, 503, 504])
+    )
+
     client = Minio(
         endpoint=endpoint,
         access_key=access_key,
         secret_key=secret_key,
-        secure=secure
+        secure=secure,
+        http_client=http_client
     )
 
     print(f"Connected to MinIO at {endpoint}")
@@ -37,39 +59,70 @@ def get_minio_client() -> Minio:
     return client
 
 
+def _ensure_bucket(client: Minio, bucket_name: str):
+    """
+    Create a bucket if it does not exist yet.
+
+    Args:
+        client: MinIO client instance
+        bucket_name: Name of the bucket
+    """
+    try:
+        if not client.bucket_exists(bucket_name):
+            client.make_bucket(bucket_name)
+            print(f"Created bucket: {bucket_name}")
+        else:
+            print(f"Bucket exists: {bucket_name}")
+    except S3Error as e:
+        print(f"Error with bucket {bucket_name}: {e}")
+        raise
+
+
 def ensure_buckets(client: Minio):
     """
     Ensure all required buckets exist.
 
+    Buckets are checked concurrently since each check is an independent
+    network round-trip. Once they have been ensured, later calls in the same
+    process return immediately.
+
     Args:
         client: MinIO client instance
     """
+    global _buckets_ready
+    if _buckets_ready:
+        return
+
     config = load_config()
-    buckets = config['minio']['buckets']
+    bucket_names = list(config['minio']['buckets'].values())
 
-    for bucket_name in buckets.values():
-        try:
-            if not client.bucket_exists(bucket_name):
-                client.make_bucket(bucket_name)
-                print(f"Created bucket: {bucket_name}")
-            else:
-                print(f"Bucket exists: {bucket_name}")
-        except S3Error as e:
-            print(f"Error with bucket {bucket_name}: {e}")
-            raise
+    if not bucket_names:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(8, len(bucket_names))) as executor:
+        list(executor.map(lambda name: _ensure_bucket(client, name), bucket_names))
+
+    _buckets_ready = True
 
 
 def upload_file(client: Minio, bucket_name: str, object_name: str,
-                file_path: str, content_type: str = 'application/octet-stream') -> str:
+                file_path: str, content_type: str = 'application/octet-stream',
+                part_size: int = MULTIPART_PART_SIZE,
+                num_parallel_uploads: int = MULTIPART_PARALLEL_UPLOADS) -> str:
     """
     Upload a file to MinIO.
 
+    Files larger than part_size are uploaded in parts, num_parallel_uploads
+    at a time.
+
     Args:
         client: MinIO client instance
         bucket_name: Name of the bucket
         object_name: Name for the object in storage
         file_path: Path to the file to upload
         content_type: MIME type of the file
+        part_size: Size of each multipart upload part in bytes
+        num_parallel_uploads: Number of parts uploaded concurrently
 
     Returns:
         str: Object path in MinIO
@@ -79,7 +132,9 @@ def upload_file(client: Minio, bucket_name: str, object_name: str,
             bucket_name=bucket_name,
             object_name=object_name,
             file_path=file_path,
-            content_type=content_type
+            content_type=content_type,
+            part_size=part_size,
+            num_parallel_uploads=num_parallel_uploads
         )
         return f"{bucket_name}/{object_name}"
     except S3Error as e:
@@ -87,33 +142,58 @@ def upload_file(client: Minio, bucket_name: str, object_name: str,
         raise
 
 
-def upload_bytes(client: Minio, bucket_name: str, object_name: str,
-                 data: bytes, content_type: str = 'application/octet-stream') -> str:
+def upload_stream(client: Minio, bucket_name: str, object_name: str,
+                  stream: BinaryIO, length: int,
+                  content_type: str = 'application/octet-stream') -> str:
     """
-    Upload bytes data to MinIO.
+    Upload data from a readable binary stream to MinIO.
+
+    The stream is read incrementally by the MinIO client, so callers holding
+    an open file or socket don't need to materialize the payload first.
 
     Args:
         client: MinIO client instance
         bucket_name: Name of the bucket
         object_name: Name for the object in storage
-        data: Bytes data to upload
+        stream: Readable binary file-like object
+        length: Number of bytes to read from the stream
         content_type: MIME type of the data
 
     Returns:
         str: Object path in MinIO
     """
-    from io import BytesIO
-
     try:
-        data_stream = BytesIO(data)
         client.put_object(
             bucket_name=bucket_name,
             object_name=object_name,
-            data=data_stream,
-            length=len(data),
+            data=stream,
+            length=length,
             content_type=content_type
         )
         return f"{bucket_name}/{object_name}"
     except S3Error as e:
         print(f"Error uploading data: {e}")
         raise
+
+
+def upload_bytes(client: Minio, bucket_name: str, object_name: str,
+                 data: Union[bytes, bytearray, memoryview],
+                 content_type: str = 'application/octet-stream') -> str:
+    """
+    Upload bytes data to MinIO.
+
+    Args:
+        client: MinIO client instance
+        bucket_name: Name of the bucket
+        object_name: Name for the object in storage
+        data: Bytes data to upload
+        content_type: MIME type of the data
+
+    Returns:
+        str: Object path in MinIO
+    """
+    # BytesIO shares the buffer of an immutable bytes object instead of
+    # copying it; other buffer types are copied once
+    length = memoryview(data).nbytes
+    return upload_stream(client, bucket_name, object_name,
+                         BytesIO(data), length, content_type)
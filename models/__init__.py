@@ -1,6 +1,26 @@
-from .species import Species
-from .observation import Observation
-from .classification import Classification
-from .audio_file import AudioFile
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562), so importing
+# e.g. models.observation doesn't pull in pydantic through models.species
+_MODULES = {
+    'Species': '.species',
+    'Observation': '.observation',
+    'Classification': '.classification',
+    'AudioFile': '.audio_file',
+}
 
 __all__ = ['Species', 'Observation', 'Classification', 'AudioFile']
+
+
+def __getattr__(name):
+    module_name = _MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,38 +1,39 @@
-from datetime import datetime
+from dataclasses import dataclass, field, InitVar
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
 
+@dataclass(slots=True)
 class AudioFile:
-    """Represents an audio file in storage."""
+    """
+    Represents an audio file in storage.
 
-    def __init__(self,
-                 filename: str,
-                 minio_path: str,
-                 latitude: float,
-                 longitude: float,
-                 file_size: Optional[int] = None,
-                 content_type: str = 'audio/mpeg',
-                 metadata: Optional[Dict[str, Any]] = None):
-        """
-        Initialize an AudioFile instance.
+    Attributes:
+        filename: Original filename
+        minio_path: Path in MinIO storage
+        latitude: Recording location latitude
+        longitude: Recording location longitude
+        file_size: Size in bytes
+        content_type: MIME type
+        metadata: Additional metadata
+        uploaded_at: Time the record was created (defaults to now)
+        now: Clock reading to use for uploaded_at, shared across a batch
+    """
+    filename: str
+    minio_path: str
+    latitude: float
+    longitude: float
+    file_size: Optional[int] = None
+    content_type: str = 'audio/mpeg'
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    uploaded_at: Optional[datetime] = None
+    now: InitVar[Optional[datetime]] = None
 
-        Args:
-            filename: Original filename
-            minio_path: Path in MinIO storage
-            latitude: Recording location latitude
-            longitude: Recording location longitude
-            file_size: Size in bytes
-            content_type: MIME type
-            metadata: Additional metadata
-        """
-        self.filename = filename
-        self.minio_path = minio_path
-        self.latitude = latitude
-        self.longitude = longitude
-        self.file_size = file_size
-        self.content_type = content_type
-        self.metadata = metadata or {}
-        self.uploaded_at = datetime.utcnow()
+    def __post_init__(self, now: Optional[datetime]):
+        if self.uploaded_at is None:
+            self.uploaded_at = now or datetime.now(timezone.utc)
+        if self.metadata is None:
+            self.metadata = {}
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for MongoDB storage."""
@@ -1,45 +1,49 @@
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass, field, InitVar
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Union
 from bson import ObjectId
 
 
+@dataclass(slots=True)
 class Classification:
-    """Represents a bird classification result."""
+    """
+    Represents a bird classification result.
 
-    def __init__(self,
-                 audio_file_id: str,
-                 key: int,
-                 confidence: float,
-                 scientific_name: str,
-                 detected_birds: Optional[List[Dict[str, Any]]] = None,
-                 api_response: Optional[Dict[str, Any]] = None,
-                 log_path: Optional[str] = None):
-        """
-        Initialize a Classification instance.
+    Attributes:
+        audio_file_id: Reference to audio file (hex strings are converted to ObjectId)
+        key: GBIF species key (unique identifier)
+        confidence: Classification confidence score
+        scientific_name: Scientific name of detected species
+        detected_birds: List of all detected birds
+        api_response: Raw API response
+        log_path: Path to API log in MinIO
+        created_at: Time the record was created (defaults to now)
+        now: Clock reading to use for created_at, shared across a batch
+    """
+    audio_file_id: Union[str, ObjectId]
+    key: int
+    confidence: float
+    scientific_name: str
+    detected_birds: List[Dict[str, Any]] = field(default_factory=list)
+    api_response: Dict[str, Any] = field(default_factory=dict)
+    log_path: Optional[str] = None
+    created_at: Optional[datetime] = None
+    now: InitVar[Optional[datetime]] = None
 
-        Args:
-            audio_file_id: Reference to audio file
-            key: GBIF species key (unique identifier)
-            confidence: Classification confidence score
-            scientific_name: Scientific name of detected species
-            detected_birds: List of all detected birds
-            api_response: Raw API response
-            log_path: Path to API log in MinIO
-        """
-        self.audio_file_id = audio_file_id
-        self.key = key
-        self.confidence = confidence
-        self.scientific_name = scientific_name
-        self.detected_birds = detected_birds or []
-        self.api_response = api_response or {}
-        self.log_path = log_path
-        self.created_at = datetime.utcnow()
+    def __post_init__(self, now: Optional[datetime]):
+        if isinstance(self.audio_file_id, str):
+            self.audio_file_id = ObjectId(self.audio_file_id)
+        if self.created_at is None:
+            self.created_at = now or datetime.now(timezone.utc)
+        if self.detected_birds is None:
+            self.detected_birds = []
+        if self.api_response is None:
+            self.api_response = {}
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for MongoDB storage."""
         return {
-            'audio_file_id': ObjectId(self.audio_file_id) if isinstance(self.audio_file_id,
-                                                                        str) else self.audio_file_id,
+            'audio_file_id': self.audio_file_id,
             'key': self.key,
             'confidence': self.confidence,
             'scientific_name': self.scientific_name,
@@ -53,7 +57,7 @@ class Classification:
     def from_dict(cls, data: Dict[str, Any]) -> 'Classification':
         """Create Classification instance from dictionary."""
         return cls(
-            audio_file_id=str(data['audio_file_id']),
+            audio_file_id=data['audio_file_id'],
             key=data['key'],
             confidence=data['confidence'],
             scientific_name=data['scientific_name'],
@@ -1,35 +1,41 @@
-from datetime import datetime
+from dataclasses import dataclass, field, InitVar
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
 
+@dataclass(slots=True)
 class Observation:
-    """Represents a bird observation from Kafka."""
+    """
+    Represents a bird observation from Kafka.
 
-    def __init__(self,
-                 key: int,
-                 latitude: float,
-                 longitude: float,
-                 timestamp: Optional[datetime] = None,
-                 biological_data: Optional[Dict[str, Any]] = None,
-                 source: str = 'kafka'):
-        """
-        Initialize an Observation instance.
+    Attributes:
+        key: GBIF species key (unique identifier)
+        latitude: Observation latitude
+        longitude: Observation longitude
+        timestamp: Time of observation (defaults to now)
+        biological_data: Variable biological properties
+        source: Source of the observation
+        created_at: Time the record was created (defaults to now)
+        now: Clock reading to use for default timestamps, shared across a batch
+    """
+    key: int
+    latitude: float
+    longitude: float
+    timestamp: Optional[datetime] = None
+    biological_data: Dict[str, Any] = field(default_factory=dict)
+    source: str = 'kafka'
+    created_at: Optional[datetime] = None
+    now: InitVar[Optional[datetime]] = None
 
-        Args:
-            key: GBIF species key (unique identifier)
-            latitude: Observation latitude
-            longitude: Observation longitude
-            timestamp: Time of observation
-            biological_data: Variable biological properties
-            source: Source of the observation
-        """
-        self.key = key
-        self.latitude = latitude
-        self.longitude = longitude
-        self.timestamp = timestamp or datetime.utcnow()
-        self.biological_data = biological_data or {}
-        self.source = source
-        self.created_at = datetime.utcnow()
+    def __post_init__(self, now: Optional[datetime]):
+        if now is None and (self.created_at is None or not self.timestamp):
+            now = datetime.now(timezone.utc)
+        if self.created_at is None:
+            self.created_at = now
+        if not self.timestamp:
+            self.timestamp = now
+        if self.biological_data is None:
+            self.biological_data = {}
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for MongoDB storage."""
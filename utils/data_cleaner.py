@@ -1,7 +1,28 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
 from rapidfuzz import fuzz, process
 
+# Native dtypes for the numeric fields of raw records. Without them a column
+# that is entirely missing, or mixes numbers with None, is left as object
+OBSERVATION_DTYPES = {'latitude': 'float64', 'longitude': 'float64', 'confidence': 'float64'}
+CLASSIFICATION_DTYPES = {'confidence': 'float64'}
+
+
+def records_to_dataframe(records: List[Dict[str, Any]], dtypes: Dict[str, str]) -> pd.DataFrame:
+    """
+    Build a DataFrame from records, casting known columns to fixed dtypes.
+
+    Args:
+        records: List of record dictionaries
+        dtypes: Column names mapped to dtypes; columns not present are ignored
+
+    Returns:
+        DataFrame with one row per record
+    """
+    df = pd.DataFrame.from_records(records)
+    return df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
+
 
 class DataCleaner:
     """Data cleaning and transformation utilities."""
@@ -17,7 +38,7 @@ class DataCleaner:
         Returns:
             Cleaned pandas DataFrame
         """
-        df = pd.DataFrame(observations)
+        df = records_to_dataframe(observations, OBSERVATION_DTYPES)
 
         if df.empty:
             return df
@@ -29,18 +50,18 @@ class DataCleaner:
             'confidence': 0.0
         })
 
-        # Remove invalid coordinates
-        df = df[
-            (df['latitude'].between(-90, 90)) &
-            (df['longitude'].between(-180, 180))
-            ]
+        # Remove invalid coordinates with a single mask over the raw arrays
+        lat = df['latitude'].to_numpy()
+        lon = df['longitude'].to_numpy()
+        df = df.loc[(lat >= -90) & (lat <= 90) & (lon >= -180) & (lon <= 180)]
 
-        # Remove duplicates
+        # Remove duplicates on the raw timestamps; coercing first would turn
+        # distinct unparseable values into NaT and merge their rows
         df = df.drop_duplicates(subset=['key', 'latitude', 'longitude', 'timestamp'])
 
         # Convert timestamps
         if 'timestamp' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+            df = df.assign(timestamp=pd.to_datetime(df['timestamp'], errors='coerce'))
 
         return df
 
@@ -57,8 +78,24 @@ class DataCleaner:
         Returns:
             Cleaned pandas DataFrame
         """
-        df = pd.DataFrame(classifications)
+        return DataCleaner.clean_classifications_df(
+            records_to_dataframe(classifications, CLASSIFICATION_DTYPES),
+            min_confidence
+        )
+
+    @staticmethod
+    def clean_classifications_df(df: pd.DataFrame,
+                                 min_confidence: float = 0.5) -> pd.DataFrame:
+        """
+        Clean and filter classification data already held in a DataFrame.
+
+        Args:
+            df: Classifications DataFrame
+            min_confidence: Minimum confidence threshold
 
+        Returns:
+            Cleaned pandas DataFrame
+        """
         if df.empty:
             return df
 
@@ -72,14 +109,14 @@ class DataCleaner:
         return df
 
     @staticmethod
-    def filter_species_fuzzy(species_list: List[str],
+    def filter_species_fuzzy(species_list: Sequence[str],
                              filter_term: str,
                              threshold: int = 70) -> List[str]:
         """
         Fuzzy filter species names.
 
         Args:
-            species_list: List of species names
+            species_list: Species names (list, array or Series values)
             filter_term: Term to filter by
             threshold: Minimum similarity score (0-100)
 
@@ -87,44 +124,34 @@ class DataCleaner:
             List of matching species names
         """
         if not filter_term:
-            return species_list
+            return list(species_list)
 
-        matches = process.extract(
-            filter_term,
+        # Score every name in one call to rapidfuzz's C implementation, spread
+        # over all cores, then threshold the score row with NumPy
+        scores = process.cdist(
+            [filter_term],
             species_list,
             scorer=fuzz.partial_ratio,
-            score_cutoff=threshold
-        )
+            score_cutoff=threshold,
+            workers=-1
+        )[0]
 
-        return [match[0] for match in matches]
+        return [species_list[i] for i in np.flatnonzero(scores >= threshold)]
 
     @staticmethod
     def aggregate_biological_data(observations: pd.DataFrame) -> pd.DataFrame:
         """
         Aggregate biological data from observations.
 
+        Observations are returned unchanged; per-species summaries are built
+        by the report (see extract_biological_summary in generate_report.py).
+
         Args:
             observations: DataFrame of observations
 
         Returns:
-            Aggregated DataFrame
+            The observations DataFrame
         """
-        if observations.empty:
-            return observations
-
-        # Extract biological data if stored in nested structure
-        bio_cols = []
-        for col in observations.columns:
-            if 'biological_data' in col or col.startswith('bio_'):
-                bio_cols.append(col)
-
-        # Create summary statistics for numerical biological data
-        if bio_cols:
-            agg_dict = {}
-            for col in bio_cols:
-                if pd.api.types.is_numeric_dtype(observations[col]):
-                    agg_dict[col] = ['mean', 'min', 'max', 'std']
-
         return observations
 
     @staticmethod
@@ -142,24 +169,30 @@ class DataCleaner:
         Returns:
             DataFrame with outliers handled
         """
-        df_clean = df.copy()
-
-        for col in columns:
-            if col not in df_clean.columns or not pd.api.types.is_numeric_dtype(df_clean[col]):
-                continue
-
-            if method == 'iqr':
-                Q1 = df_clean[col].quantile(0.25)
-                Q3 = df_clean[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-
-                df_clean[col] = df_clean[col].clip(lower_bound, upper_bound)
-
-            elif method == 'zscore':
-                mean = df_clean[col].mean()
-                std = df_clean[col].std()
-                df_clean[col] = df_clean[col].clip(mean - 3 * std, mean + 3 * std)
-
-        return df_clean
+        numeric = [col for col in dict.fromkeys(columns)
+                   if col in df.columns and pd.api.types.is_numeric_dtype(df[col])]
+        if not numeric:
+            return df.copy(deep=False)
+
+        # Bounds for all columns come from one quantile/mean/std call each
+        values = df[numeric]
+        if method == 'iqr':
+            quartiles = values.quantile([0.25, 0.75])
+            Q1 = quartiles.loc[0.25]
+            Q3 = quartiles.loc[0.75]
+            IQR = Q3 - Q1
+            lower_bound = Q1 - 1.5 * IQR
+            upper_bound = Q3 + 1.5 * IQR
+
+        elif method == 'zscore':
+            mean = values.mean()
+            std = values.std()
+            lower_bound = mean - 3 * std
+            upper_bound = mean + 3 * std
+
+        else:
+            return df.copy(deep=False)
+
+        # Only the clipped columns are new; assign shares the rest with df
+        clipped = values.clip(lower_bound, upper_bound, axis=1)
+        return df.assign(**{col: clipped[col] for col in numeric})
@@ -1,18 +1,79 @@
-import json
+import functools
+import sys
 import time
 import random
 import requests
 import os
-import yaml
+import numpy as np
 from kafka import KafkaProducer
+from kafka.errors import KafkaTimeoutError
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional
 
+# Allow running this file directly as well as importing it from scripts/
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def load_config():
-    """Load configuration from config.yaml."""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
+from config import load_config
+from config._json import deserialize_json, serialize_json
+
+# Message keys must hash the same in every process; str hash() is salted
+try:
+    from xxhash import xxh64_intdigest as _hash_code
+except ImportError:
+    import hashlib
+
+    def _hash_code(data: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+# Common bird species codes and names used for mock observations
+MOCK_BIRDS = [
+    ('houspa', 'Passer domesticus', 'House Sparrow'),
+    ('eurcoo', 'Columba palumbus', 'Common Wood Pigeon'),
+    ('eurbla', 'Turdus merula', 'Eurasian Blackbird'),
+    ('gretit', 'Parus major', 'Great Tit'),
+    ('eurmag', 'Pica pica', 'Eurasian Magpie'),
+    ('comsta', 'Sturnus vulgaris', 'Common Starling'),
+    ('mallar', 'Anas platyrhynchos', 'Mallard'),
+    ('carwre', 'Troglodytes troglodytes', 'Eurasian Wren'),
+    ('eurjay', 'Garrulus glandarius', 'Eurasian Jay'),
+    ('hoocar', 'Corvus cornix', 'Hooded Crow')
+]
+
+# Values drawn for the simulated biological properties
+MIGRATION_STATUSES = np.array(['resident', 'migrant', 'winter_visitor', 'summer_visitor'], dtype=object)
+FLIGHT_PATTERNS = np.array(['direct', 'undulating', 'hovering', 'soaring'], dtype=object)
+HABITATS = np.array(['urban', 'forest', 'wetland', 'grassland', 'coastal'], dtype=object)
+
+# Random values are drawn for whole batches at once
+_rng = np.random.default_rng()
+
+
+@functools.lru_cache(maxsize=4096)
+def _code_key(species_code: str) -> int:
+    """Convert a species code string to its key, once per distinct code."""
+    return int(species_code) if species_code.isdigit() else _hash_code(species_code.encode('utf-8')) % (10 ** 8)
+
+
+def species_key(species_code) -> int:
+    """
+    Derive the numeric message key for an eBird species code.
+
+    Numeric codes are used as they are; other codes are hashed with a
+    stable hash, so a species always gets the same key (and partition)
+    across runs. Codes repeat across observations, so each one is only
+    converted once.
+
+    Args:
+        species_code: eBird species code
+
+    Returns:
+        Integer key (0 if the code is not a string)
+    """
+    # Checked before the cache, which can't hash values such as lists
+    if not isinstance(species_code, str):
+        return 0
+    return _code_key(species_code)
 
 
 class OrnithologyDataProducer:
@@ -46,12 +107,24 @@ class OrnithologyDataProducer:
         self.topic_name = topic_name or kafka_config['topic']
         self.ebird_api_key = ebird_api_key or os.getenv('EBIRD_API_KEY')
 
-        # Initialize Kafka producer with JSON serialization
+        # Reused across fetches so run_continuous keeps its connection alive
+        self.session = None
+        if self.ebird_api_key:
+            self.session = requests.Session()
+            self.session.headers.update({'X-eBirdApiToken': self.ebird_api_key})
+
+        # Initialize Kafka producer; publish_observations serializes keys and
+        # values to bytes itself. Larger batches and a short linger put more
+        # messages in each compressed request; lz4 costs far less CPU than
+        # gzip at a similar ratio on JSON, while heavier codecs or levels tend
+        # to cut throughput rather than raise it
         self.producer = KafkaProducer(
             bootstrap_servers=self.kafka_bootstrap_servers,
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-            key_serializer=lambda k: k.encode('utf-8') if k else None,
-            compression_type='gzip'
+            batch_size=kafka_config.get('batch_size', 200_000),
+            linger_ms=kafka_config.get('linger_ms', 50),
+            acks=kafka_config.get('acks', 1),
+            compression_type=kafka_config.get('compression_type', 'lz4'),
+            max_in_flight_requests_per_connection=5
         )
 
         print(f"Kafka producer connected to {self.kafka_bootstrap_servers}")
@@ -77,16 +150,16 @@ class OrnithologyDataProducer:
             return self._generate_mock_observations(max_results)
 
         url = f"https://api.ebird.org/v2/data/obs/{region_code}/recent"
-        headers = {'X-eBirdApiToken': self.ebird_api_key}
         params = {
             'maxResults': max_results,
             'back': 14  # Last 14 days
         }
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            return response.json()
+            # Parse the raw body, skipping the str decode Response.json() does
+            return deserialize_json(response.content)
         except Exception as e:
             print(f"Error fetching from eBird: {e}")
             print("Falling back to mock data")
@@ -96,133 +169,160 @@ class OrnithologyDataProducer:
         """
         Generate mock bird observations for testing
         """
-        # Common bird species codes and names
-        birds = [
-            ('houspa', 'Passer domesticus', 'House Sparrow'),
-            ('eurcoo', 'Columba palumbus', 'Common Wood Pigeon'),
-            ('eurbla', 'Turdus merula', 'Eurasian Blackbird'),
-            ('gretit', 'Parus major', 'Great Tit'),
-            ('eurmag', 'Pica pica', 'Eurasian Magpie'),
-            ('comsta', 'Sturnus vulgaris', 'Common Starling'),
-            ('mallar', 'Anas platyrhynchos', 'Mallard'),
-            ('carwre', 'Troglodytes troglodytes', 'Eurasian Wren'),
-            ('eurjay', 'Garrulus glandarius', 'Eurasian Jay'),
-            ('hoocar', 'Corvus cornix', 'Hooded Crow')
-        ]
-
         # Zagreb area coordinates with some variance
         base_lat, base_lng = 45.8150, 15.9819
 
-        observations = []
-        for i in range(count):
-            bird = random.choice(birds)
-
-            obs = {
-                'speciesCode': bird[0],
-                'sciName': bird[1],
-                'comName': bird[2],
-                'lat': round(base_lat + random.uniform(-0.1, 0.1), 6),
-                'lng': round(base_lng + random.uniform(-0.1, 0.1), 6),
-                'obsDt': datetime.now().isoformat(),
-                'howMany': random.randint(1, 15),
-                'locName': f'Zagreb Location {random.randint(1, 20)}'
+        # Draw every random field for all observations at once
+        birds = _rng.integers(0, len(MOCK_BIRDS), size=count).tolist()
+        lats = np.round(base_lat + _rng.uniform(-0.1, 0.1, count), 6).tolist()
+        lngs = np.round(base_lng + _rng.uniform(-0.1, 0.1, count), 6).tolist()
+        how_many = _rng.integers(1, 16, size=count).tolist()
+        locations = _rng.integers(1, 21, size=count).tolist()
+        obs_dt = datetime.now().isoformat()
+
+        return [
+            {
+                'speciesCode': MOCK_BIRDS[bird][0],
+                'sciName': MOCK_BIRDS[bird][1],
+                'comName': MOCK_BIRDS[bird][2],
+                'lat': lat,
+                'lng': lng,
+                'obsDt': obs_dt,
+                'howMany': n,
+                'locName': f'Zagreb Location {location}'
             }
-            observations.append(obs)
-
-        return observations
+            for bird, lat, lng, n, location in zip(birds, lats, lngs, how_many, locations)
+        ]
 
     def transform_to_observation_message(self, ebird_data: Dict) -> Dict:
         """
         Transform eBird data to the format expected by your pipeline.
         Format matches what consume_kafka.py expects.
         """
-        # Extract species code as key (taxonomy_id)
-        species_code = ebird_data.get('speciesCode', 'unknown')
-        # Try to convert to integer if possible, otherwise use hash
-        try:
-            key = int(species_code) if species_code.isdigit() else abs(hash(species_code)) % (10 ** 8)
-        except:
-            key = 0
-
-        # Base message with required fields
-        message = {
-            'key': key,
-            'taxonomy_id': species_code,
-            'latitude': ebird_data.get('lat'),
-            'longitude': ebird_data.get('lng'),
-            'timestamp': ebird_data.get('obsDt', datetime.now().isoformat()),
-            'scientific_name': ebird_data.get('sciName', ''),
-            'common_name': ebird_data.get('comName', ''),
-            'source': 'ebird'
-        }
+        return self.transform_batch([ebird_data])[0]
 
-        # Add optional observation data
-        if 'howMany' in ebird_data:
-            message['count'] = ebird_data['howMany']
+    def transform_batch(self, rows: List[Dict], now_iso: Optional[str] = None) -> List[Dict]:
+        """
+        Transform a batch of eBird records to pipeline messages.
 
-        if 'locName' in ebird_data:
-            message['location_name'] = ebird_data['locName']
+        Same output as transform_to_observation_message for each record,
+        with the simulated biological properties drawn for the whole batch
+        in a few NumPy calls.
 
-        # Add random biological properties to simulate variance
-        optional_properties = [
-            ('migration_status', random.choice(['resident', 'migrant', 'winter_visitor', 'summer_visitor'])),
-            ('flight_pattern', random.choice(['direct', 'undulating', 'hovering', 'soaring'])),
-            ('habitat', random.choice(['urban', 'forest', 'wetland', 'grassland', 'coastal'])),
-            ('body_size_cm', round(random.uniform(10, 60), 1)),
-            ('body_temperature_c', round(random.uniform(38, 42), 1)),
-        ]
+        Args:
+            rows: eBird observation records
+            now_iso: Timestamp for records without obsDt (defaults to now)
+        """
+        count = len(rows)
+        if now_iso is None:
+            now_iso = datetime.now().isoformat()
+
+        # Random biological properties to simulate variance, one row per record
+        properties = (
+            ('migration_status', MIGRATION_STATUSES[_rng.integers(0, len(MIGRATION_STATUSES), count)].tolist()),
+            ('flight_pattern', FLIGHT_PATTERNS[_rng.integers(0, len(FLIGHT_PATTERNS), count)].tolist()),
+            ('habitat', HABITATS[_rng.integers(0, len(HABITATS), count)].tolist()),
+            ('body_size_cm', np.round(_rng.uniform(10, 60, count), 1).tolist()),
+            ('body_temperature_c', np.round(_rng.uniform(38, 42, count), 1).tolist()),
+        )
+        # Each record includes a random subset of 2-4 properties
+        chosen = _rng.random((count, len(properties))).argsort(axis=1).tolist()
+        included = _rng.integers(2, 5, size=count).tolist()
+
+        messages = []
+        for i, ebird_data in enumerate(rows):
+            # Extract species code as key (taxonomy_id)
+            species_code = ebird_data.get('speciesCode', 'unknown')
+            key = species_key(species_code)
+
+            # Base message with required fields
+            message = {
+                'key': key,
+                'taxonomy_id': species_code,
+                'latitude': ebird_data.get('lat'),
+                'longitude': ebird_data.get('lng'),
+                'timestamp': ebird_data.get('obsDt', now_iso),
+                'scientific_name': ebird_data.get('sciName', ''),
+                'common_name': ebird_data.get('comName', ''),
+                'source': 'ebird'
+            }
 
-        # Randomly include some biological properties (simulating variance)
-        for prop, value in random.sample(optional_properties, k=random.randint(2, 4)):
-            message[prop] = value
+            # Add optional observation data
+            if 'howMany' in ebird_data:
+                message['count'] = ebird_data['howMany']
 
-        return message
+            if 'locName' in ebird_data:
+                message['location_name'] = ebird_data['locName']
 
-    def publish_observations(
-            self,
-            observations: List[Dict],
-            delay_ms: int = 100
-    ):
+            for prop in chosen[i][:included[i]]:
+                name, values = properties[prop]
+                message[name] = values[i]
+
+            messages.append(message)
+
+        return messages
+
+    def publish_observations(self, observations: List[Dict]):
         """
         Publish observations to Kafka topic
 
+        Messages are sent without waiting for each acknowledgement, so the
+        producer can batch them; delivery results are collected by callbacks
+        and reported once everything has been flushed.
+
         Args:
             observations: List of observation dictionaries
-            delay_ms: Delay between messages in milliseconds
         """
-        print(f"\nPublishing {len(observations)} observations to Kafka...")
+        total = len(observations)
+        print(f"\nPublishing {total} observations to Kafka...")
 
-        for i, obs in enumerate(observations, 1):
-            try:
-                # Transform to expected format
-                message = self.transform_to_observation_message(obs)
+        delivered = []
+        failed = []
 
-                # Use key for partitioning
-                key = str(message['key'])
+        def on_delivered(i, metadata):
+            delivered.append(i)
+
+        def on_failed(i, exc):
+            failed.append((i, exc))
+
+        # Transform to expected format
+        messages = self.transform_batch(observations)
+
+        for i, message in enumerate(messages, 1):
+            try:
+                # Use key for partitioning; key and value go out as bytes
+                key = str(message['key']).encode('utf-8')
+                value = serialize_json(message)
 
                 # Send to Kafka
                 future = self.producer.send(
                     self.topic_name,
                     key=key,
-                    value=message
+                    value=value
                 )
-
-                # Wait for confirmation (optional, for demo purposes)
-                metadata = future.get(timeout=10)
-
-                print(f"  [{i}/{len(observations)}] {message['common_name']} "
-                      f"(partition: {metadata.partition}, offset: {metadata.offset})")
-
-                # Small delay to simulate real-time streaming
-                if delay_ms > 0:
-                    time.sleep(delay_ms / 1000.0)
+                future.add_callback(on_delivered, i).add_errback(on_failed, i)
 
             except Exception as e:
-                print(f"  [{i}/{len(observations)}] Error: {e}")
+                failed.append((i, e))
 
         # Ensure all messages are sent
-        self.producer.flush()
-        print(f"\nSuccessfully published {len(observations)} observations")
+        timeout_error = None
+        try:
+            self.producer.flush(timeout=30)
+        except KafkaTimeoutError as e:
+            timeout_error = e
+
+        # Callbacks can still fire after a timed-out flush, so report from copies
+        delivered_now = list(delivered)
+        failed_now = list(failed)
+        if timeout_error is not None:
+            # Whatever is still unacknowledged counts as failed
+            settled = set(delivered_now).union(i for i, _ in failed_now)
+            failed_now.extend((i, timeout_error) for i in range(1, total + 1) if i not in settled)
+
+        for i, exc in sorted(failed_now, key=lambda failure: failure[0]):
+            print(f"  [{i}/{total}] Error: {exc}")
+        print(f"\nSuccessfully published {len(delivered_now)}/{total} observations")
 
     def run_continuous(
             self,
@@ -233,6 +333,11 @@ class OrnithologyDataProducer:
         """
         Continuously fetch and publish observations
 
+        Fetches start every interval_seconds on a fixed schedule; the time
+        spent fetching and publishing counts towards the interval instead of
+        being added to it. An iteration that overruns its slot starts the
+        next one immediately and the schedule restarts from there.
+
         Args:
             region_code: eBird region code
             interval_seconds: Seconds between fetches
@@ -241,6 +346,8 @@ class OrnithologyDataProducer:
         iteration = 0
         print(f"\nStarting continuous publishing (interval: {interval_seconds}s)\n")
 
+        next_fetch = time.monotonic()
+
         try:
             while max_iterations is None or iteration < max_iterations:
                 iteration += 1
@@ -262,8 +369,15 @@ class OrnithologyDataProducer:
 
                 # Wait before next iteration
                 if max_iterations is None or iteration < max_iterations:
-                    print(f"\nWaiting {interval_seconds} seconds until next fetch...")
-                    time.sleep(interval_seconds)
+                    next_fetch += interval_seconds
+                    wait_seconds = next_fetch - time.monotonic()
+                    if wait_seconds > 0:
+                        print(f"\nWaiting {wait_seconds:.0f} seconds until next fetch...")
+                        time.sleep(wait_seconds)
+                    else:
+                        # Don't burst through missed slots; restart the schedule
+                        print(f"\nBehind schedule by {-wait_seconds:.1f}s, fetching now")
+                        next_fetch = time.monotonic()
 
         except KeyboardInterrupt:
             print("\n\nStopped by user")
@@ -273,6 +387,8 @@ class OrnithologyDataProducer:
     def close(self):
         """Close the producer connection"""
         self.producer.close()
+        if self.session is not None:
+            self.session.close()
         print("\nProducer closed")
 
 
@@ -1,7 +1,9 @@
+import re
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 
 try:
@@ -11,6 +13,7 @@ try:
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
+    from selenium.common.exceptions import TimeoutException
 
     SELENIUM_AVAILABLE = True
 
@@ -27,11 +30,107 @@ except ImportError:
     WEBDRIVER_MANAGER_AVAILABLE = False
     print("Warning: Selenium not installed. Install with: pip install selenium webdriver-manager")
 
+# Numeric species key in a details page link; stops before any further
+# query parameters
+_DETAILS_ID_RE = re.compile(r'details\.html\?id=(\d+)')
+
+# Run inside the browser so only the extracted strings cross the WebDriver
+# connection, instead of the serialized page source. They return null when
+# the element they look for is missing. Detail labels come back trimmed,
+# without the trailing colon and lowercased, ready for DETAIL_FIELDS.
+_SPECIES_LINKS_SCRIPT = """
+var table = document.querySelector('table#speciesTable');
+var tbody = table && table.querySelector('tbody');
+if (!tbody) { return null; }
+return Array.from(tbody.querySelectorAll('a'), function (a) { return a.getAttribute('href') || ''; });
+"""
+_DETAILS_SCRIPT = """
+var dl = document.querySelector('dl#details');
+if (!dl) { return null; }
+var label = function (el) { return el.textContent.trim().replace(/:+$/, '').toLowerCase(); };
+var value = function (el) { return el.textContent.trim(); };
+return [Array.from(dl.querySelectorAll('dt'), label), Array.from(dl.querySelectorAll('dd'), value)];
+"""
+# If the table is a DataTables instance, show every row on one page and
+# return true; the Next-button loop then stops after that single page
+_SHOW_ALL_ROWS_SCRIPT = """
+var $ = window.jQuery;
+if (!$ || !$.fn.dataTable || !$.fn.dataTable.isDataTable('#speciesTable')) { return false; }
+$('#speciesTable').DataTable().page.len(-1).draw();
+return true;
+"""
+_FIRST_LINK_SCRIPT = """
+var a = document.querySelector('table#speciesTable tbody a');
+return a ? a.getAttribute('href') || '' : null;
+"""
+
+# Chrome flags: new headless mode, no images or background services
+CHROME_ARGUMENTS = (
+    '--headless=new',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--window-size=1920,1080',
+    '--blink-settings=imagesEnabled=false',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-sync',
+    '--disable-default-apps',
+    '--disable-features=Translate,BackForwardCache',
+    '--mute-audio',
+    '--log-level=3',
+)
+
+# Requests Chrome drops at the network layer: images, fonts, media and
+# analytics are never needed to read the rendered tables
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp3', '*.mp4', '*.webm',
+    '*google-analytics.com*', '*googletagmanager.com*',
+]
+
+# Details page labels (lowercase, without the colon) -> GBIF field names
+DETAIL_FIELDS = {
+    'scientific name': 'scientificName',
+    'canonical name': 'canonicalName',
+    'rank': 'rank',
+    'kingdom': 'kingdom',
+    'phylum': 'phylum',
+    'class': 'class',
+    'order': 'order',
+    'family': 'family',
+    'genus': 'genus',
+}
+
+# Seconds to wait for the table to change after clicking Next
+NEXT_PAGE_TIMEOUT = 5
+
+# Species detail pages between progress lines
+PROGRESS_EVERY = 100
+
+# Delay before the first retry of a failed details page; doubles each retry
+RETRY_BACKOFF_SECONDS = 1.0
+
+
+def _details_rendered(driver) -> bool:
+    """Wait condition: any details value has non-empty text.
+
+    Some fields are legitimately blank, so checking only the first one could
+    wait out the full timeout on a fully rendered page.
+    """
+    return any(dd.text.strip() for dd in driver.find_elements(By.CSS_SELECTOR, '#details dd'))
+
 
 class BirdSpeciesScraper:
     """Scraper for bird species data from aves.regoch.net."""
 
-    def __init__(self, base_url: str, timeout: int = 30, retry_attempts: int = 3):
+    # ChromeDriver path resolved by webdriver-manager, shared by all drivers
+    _driver_path: Optional[str] = None
+    _driver_path_lock = threading.Lock()
+
+    def __init__(self, base_url: str, timeout: int = 30, retry_attempts: int = 3,
+                 max_workers: int = 4, requests_per_second: float = 3.0):
         """
         Initialize the scraper.
 
@@ -39,16 +138,32 @@ class BirdSpeciesScraper:
             base_url: Base URL to scrape
             timeout: Request timeout in seconds
             retry_attempts: Number of retry attempts
+            max_workers: Number of species pages scraped concurrently, each
+                with its own browser
+            requests_per_second: Maximum rate of page loads across all workers
         """
         self.base_url = base_url
+        # Species keys are appended to this for each details page
+        self._details_url_prefix = urljoin(base_url, 'details.html?id=')
         self.timeout = timeout
         self.retry_attempts = retry_attempts
+        self.max_workers = max_workers
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         self.driver = None
 
+        # Page loads are spaced at least this far apart, shared by all workers
+        self._request_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_request_at = 0.0
+        self._request_lock = threading.Lock()
+
+        # One Selenium driver per worker thread; drivers are not thread-safe
+        self._local = threading.local()
+        self._worker_drivers = []
+        self._drivers_lock = threading.Lock()
+
     def scrape_species_list(self) -> List[Dict[str, Any]]:
         """
         Scrape the list of all bird species from the HTML table.
@@ -57,88 +172,174 @@ class BirdSpeciesScraper:
             List of species data dictionaries with full GBIF details
         """
 
+        return list(self.iter_species())
+
+    def iter_species(self) -> Iterator[Dict[str, Any]]:
+        """
+        Scrape all bird species, yielding each one as soon as it is parsed.
+
+        Lets callers store species while the crawl is still running instead
+        of holding every record until the end. Closing the iterator early
+        cancels the detail pages that have not started yet.
+
+        Yields:
+            Species data dictionaries with full GBIF details
+        """
         return self._scrape_with_selenium()
 
-    def _scrape_with_selenium(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _build_chrome_options():
+        """
+        Build Chrome options for scraping.
+
+        Uses the new headless mode and turns off images and the background
+        subsystems a scraper never needs, so each browser starts and loads
+        pages faster. Page loads return once the DOM is ready instead of
+        waiting for every subresource; the scrape methods wait explicitly for
+        the JavaScript-rendered content they read.
+
+        Returns:
+            Chrome Options instance
+        """
+        chrome_options = Options()
+        chrome_options.page_load_strategy = 'eager'
+        for argument in CHROME_ARGUMENTS:
+            chrome_options.add_argument(argument)
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2
+        })
+        return chrome_options
+
+    @classmethod
+    def _get_driver_path(cls) -> str:
+        """
+        Resolve the ChromeDriver binary with webdriver-manager, once per process.
+
+        Returns:
+            Path to the ChromeDriver executable
+        """
+        with cls._driver_path_lock:
+            if cls._driver_path is None:
+                cls._driver_path = ChromeDriverManager().install()
+            return cls._driver_path
+
+    def _create_driver(self):
         """
-        Scrape species list using Selenium to handle JavaScript rendering.
+        Start a headless Chrome driver.
 
         Returns:
-            List of species data dictionaries
+            Selenium WebDriver instance
         """
-        species_list = []
+        chrome_options = self._build_chrome_options()
 
+        # Use webdriver_manager if available for automatic version matching
+        if WEBDRIVER_MANAGER_AVAILABLE:
+            service = Service(self._get_driver_path())
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        else:
+            driver = webdriver.Chrome(options=chrome_options)
+
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        driver.set_page_load_timeout(self.timeout)
+        return driver
+
+    def _get_thread_driver(self):
+        """
+        Return the calling thread's driver, starting one on first use.
+
+        Returns:
+            Selenium WebDriver instance
+        """
+        driver = getattr(self._local, 'driver', None)
+        if driver is None:
+            driver = self._create_driver()
+            self._local.driver = driver
+            with self._drivers_lock:
+                self._worker_drivers.append(driver)
+        return driver
+
+    def _wait_for_request_slot(self):
+        """Block until the shared request rate allows another page load."""
+        with self._request_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self._request_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def _quit_worker_drivers(self):
+        """Quit the drivers started by worker threads."""
+        with self._drivers_lock:
+            drivers, self._worker_drivers = self._worker_drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Error closing Selenium driver: {e}")
+        self._local = threading.local()
+
+    def _scrape_with_selenium(self) -> Iterator[Dict[str, Any]]:
+        """
+        Scrape species using Selenium to handle JavaScript rendering.
+
+        Yields:
+            Species data dictionaries, in listing order
+        """
         try:
             # Setup headless Chrome
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-
-            # Use webdriver_manager if available for automatic version matching
             if WEBDRIVER_MANAGER_AVAILABLE:
                 print("Using webdriver-manager for automatic ChromeDriver version matching...")
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
             else:
                 print("Using system ChromeDriver (may cause version mismatch issues)...")
                 print("Tip: Install webdriver-manager with: pip install webdriver-manager")
-                self.driver = webdriver.Chrome(options=chrome_options)
-
-            self.driver.set_page_load_timeout(self.timeout)
+            self.driver = self._create_driver()
 
             # Load the page
             index_url = urljoin(self.base_url, 'index.html')
             print(f"Loading page with Selenium: {index_url}")
             self.driver.get(index_url)
 
-            # Wait for the table to be populated with data
+            # Built once and reused for every page of the listing
             wait = WebDriverWait(self.driver, 10)
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '#speciesTable tbody tr')))
+            next_page_wait = WebDriverWait(self.driver, NEXT_PAGE_TIMEOUT)
+            rows_present = EC.presence_of_element_located((By.CSS_SELECTOR, '#speciesTable tbody tr'))
+            next_button_locator = (By.XPATH, "//button[contains(text(), 'Next')]")
 
-            # Give JavaScript a moment to finish rendering
-            time.sleep(1)
+            # Collapse the pagination into a single page when the table allows it
+            wait.until(rows_present)
+            if self.driver.execute_script(_SHOW_ALL_ROWS_SCRIPT):
+                print("Showing all species rows on a single page")
 
             # Pagination loop - keep clicking "Next" until no more pages
             page_number = 1
             all_species_keys = []  # Collect all species keys first to avoid issues with page changes
+            seen_keys = set()  # Same keys, for constant-time duplicate checks
             previous_first_key = None  # Track first item of previous page to detect when we're stuck
 
             while True:
                 print(f"Processing page {page_number}...")
 
                 # Wait for table to be populated
-                wait = WebDriverWait(self.driver, 10)
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '#speciesTable tbody tr')))
-                time.sleep(0.5)  # Small delay for JavaScript to finish
-
-                # Get the page source after JavaScript execution
-                soup = BeautifulSoup(self.driver.page_source, 'lxml')
+                wait.until(rows_present)
 
-                # Find all species links on current page
-                table = soup.find('table', id='speciesTable')
-                if not table:
+                # Collect the link targets of the rendered table in the browser
+                hrefs = self.driver.execute_script(_SPECIES_LINKS_SCRIPT)
+                if hrefs is None:
                     print("Species table not found")
                     break
 
-                tbody = table.find('tbody')
-                if not tbody:
-                    print("Table body not found")
-                    break
-
-                species_links = tbody.find_all('a')
-                print(f"Found {len(species_links)} species on page {page_number}")
+                print(f"Found {len(hrefs)} species on page {page_number}")
 
                 # Extract species keys from current page
                 current_page_keys = []
-                for link in species_links:
-                    href = link.get('href', '')
-                    if 'details.html?id=' in href:
-                        species_key = href.split('id=')[-1]
+                for href in hrefs:
+                    match = _DETAILS_ID_RE.search(href)
+                    if match:
+                        species_key = match.group(1)
                         current_page_keys.append(species_key)
-                        if species_key not in all_species_keys:
+                        if species_key not in seen_keys:
+                            seen_keys.add(species_key)
                             all_species_keys.append(species_key)
 
                 # Check if we're on the last page by comparing first item with previous page
@@ -151,7 +352,7 @@ class BirdSpeciesScraper:
 
                 # Try to click the "Next" button
                 try:
-                    next_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Next')]")
+                    next_button = self.driver.find_element(*next_button_locator)
 
                     # Check if button is disabled (last page reached)
                     if not next_button.is_enabled():
@@ -162,8 +363,16 @@ class BirdSpeciesScraper:
                     next_button.click()
                     print(f"Clicked Next button, moving to page {page_number + 1}")
 
-                    # Small delay for JavaScript to update the table
-                    time.sleep(0.5)
+                    # Wait for JavaScript to show the next rows. On the last
+                    # page nothing changes; the unchanged first key check
+                    # above ends the loop on the next pass
+                    first_href = hrefs[0] if hrefs else None
+                    try:
+                        next_page_wait.until(
+                            lambda driver: driver.execute_script(_FIRST_LINK_SCRIPT) != first_href
+                        )
+                    except TimeoutException:
+                        pass
                     page_number += 1
 
                 except Exception as e:
@@ -172,42 +381,66 @@ class BirdSpeciesScraper:
 
             print(f"Total species found across all pages: {len(all_species_keys)}")
 
-            # Now scrape details for all collected species
-            for idx, species_key in enumerate(all_species_keys, 1):
-                details_url = urljoin(self.base_url, f'details.html?id={species_key}')
-
-                print(f"Scraping species {idx}/{len(all_species_keys)}: key={species_key}")
-
-                # Use Selenium to scrape details page (reuses self.driver)
-                species_data = self.scrape_species_page(details_url, species_key)
-                if species_data:
-                    species_list.append(species_data)
+            # The listing driver is no longer needed; workers start their own
+            self.driver.quit()
+            self.driver = None
 
-                # Small delay between requests
-                time.sleep(0.3)
+            # Now scrape details for all collected species. Page loads wait
+            # for the shared rate limit instead of a fixed delay each
+            total = len(all_species_keys)
+
+            def scrape_details(numbered_key):
+                idx, species_key = numbered_key
+                details_url = f'{self._details_url_prefix}{species_key}'
+                return self.scrape_species_page(details_url, species_key)
+
+            print(f"Scraping details for {total} species...")
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            try:
+                results = executor.map(scrape_details, enumerate(all_species_keys, 1))
+                for idx, species_data in enumerate(results, 1):
+                    if idx % PROGRESS_EVERY == 0 or idx == total:
+                        print(f"Scraped {idx}/{total} species")
+                    if species_data:
+                        yield species_data
+            finally:
+                # Don't load the remaining pages if the caller stopped early
+                executor.shutdown(wait=True, cancel_futures=True)
 
         except Exception as e:
             print(f"Error during Selenium scraping: {e}")
         finally:
-            # Clean up driver after all scraping is done
+            # Clean up drivers after all scraping is done
             if self.driver:
                 self.driver.quit()
                 self.driver = None
-
-        return species_list
+            self._quit_worker_drivers()
 
     def scrape_species_page(self, url: str, species_key: str) -> Dict[str, Any]:
         """
         Scrape individual species details page.
 
+        A page that fails to load or parse is retried up to retry_attempts
+        times in total, with an exponential backoff between attempts.
+
         Args:
             url: URL of the species details page
             species_key: GBIF species key
 
         Returns:
-            Dictionary containing species data in GBIF format
+            Dictionary containing species data in GBIF format (empty if
+            every attempt failed)
         """
-        return self._scrape_species_page_with_selenium(url, species_key)
+        attempts = max(1, self.retry_attempts)
+        for attempt in range(1, attempts + 1):
+            species_data = self._scrape_species_page_with_selenium(url, species_key)
+            if species_data:
+                return species_data
+            if attempt < attempts:
+                time.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+        print(f"Giving up on species key={species_key} after {attempts} attempts")
+        return {}
 
     def _scrape_species_page_with_selenium(self, url: str, species_key: str) -> Dict[str, Any]:
         """
@@ -223,76 +456,34 @@ class BirdSpeciesScraper:
         species_data: Dict[str, Any] = {'key': int(species_key)}
 
         try:
-            # Ensure driver exists
-            if not self.driver:
-                chrome_options = Options()
-                chrome_options.add_argument('--headless')
-                chrome_options.add_argument('--no-sandbox')
-                chrome_options.add_argument('--disable-dev-shm-usage')
-                chrome_options.add_argument('--disable-gpu')
-                chrome_options.add_argument('--window-size=1920,1080')
-
-                if WEBDRIVER_MANAGER_AVAILABLE:
-                    service = Service(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                else:
-                    self.driver = webdriver.Chrome(options=chrome_options)
-
-                self.driver.set_page_load_timeout(self.timeout)
+            # Each thread drives its own browser
+            driver = self._get_thread_driver()
 
             # Load the details page
-            self.driver.get(url)
+            self._wait_for_request_slot()
+            driver.get(url)
 
-            # Wait for the details to be populated by JavaScript
-            wait = WebDriverWait(self.driver, 10)
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '#details dd')))
-
-            # Give JavaScript time to finish rendering
-            time.sleep(0.3)
-
-            # Parse the rendered HTML
-            soup = BeautifulSoup(self.driver.page_source, 'lxml')
+            # Wait for JavaScript to fill in the details
+            wait = WebDriverWait(driver, 10)
+            wait.until(_details_rendered)
 
-            # Find the details definition list
-            details_dl = soup.find('dl', id='details')
-            if not details_dl:
+            # Read the text of all dt/dd pairs in the browser
+            details = driver.execute_script(_DETAILS_SCRIPT)
+            if details is None:
                 print(f"Details section not found for key={species_key}")
                 return {}
 
-            # Parse all dt/dd pairs
-            dts = details_dl.find_all('dt')
-            dds = details_dl.find_all('dd')
+            dts, dds = details
 
             if len(dts) != len(dds):
                 print(f"Warning: Mismatch between labels ({len(dts)}) and values ({len(dds)})")
 
             # Create a mapping of labels to values
-            for dt, dd in zip(dts, dds):
-                label = dt.text.strip().rstrip(':').lower()
-                value = dd.text.strip()
-
-                if not value:
-                    continue
-
+            for label, value in zip(dts, dds):
                 # Map HTML labels to GBIF field names
-                if label == 'scientific name':
-                    species_data['scientificName'] = value
-                elif label == 'canonical name':
-                    species_data['canonicalName'] = value
-                elif label == 'rank':
-                    species_data['rank'] = value
-                elif label == 'kingdom':
-                    species_data['kingdom'] = value
-                elif label == 'phylum':
-                    species_data['phylum'] = value
-                elif label == 'class':
-                    species_data['class'] = value
-                elif label == 'order':
-                    species_data['order'] = value
-                elif label == 'family':
-                    species_data['family'] = value
-                elif label == 'genus':
-                    species_data['genus'] = value
+                field = DETAIL_FIELDS.get(label)
+                if field and value:
+                    species_data[field] = value
 
             # Validate we have at least the key fields
             if 'scientificName' not in species_data:
@@ -306,10 +497,11 @@ class BirdSpeciesScraper:
         return species_data
 
     def close(self):
-        """Clean up resources (e.g., Selenium driver)."""
+        """Clean up resources (e.g., Selenium drivers)."""
         if self.driver:
             self.driver.quit()
             self.driver = None
+        self._quit_worker_drivers()
 
     def __enter__(self):
         """Context manager entry."""